@@ -1,366 +1,58 @@
 import streamlit as st
 import pandas as pd
 import oracledb
-import hashlib
 import datetime
 from datetime import timedelta  # Add this import
 import os
 import time
+import random
+import bisect
+import threading
+import asyncio
+import contextvars
+import collections
+from concurrent.futures import ThreadPoolExecutor
+from metrics import (rerun_stats, count_rerun_stat, background_task, get_query_metrics,
+                     export_prometheus_metrics, new_query_record, SLOW_QUERY_MS)
+from db import (DB_BACKEND, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, DB_SERVICE, DB_POOL_MIN, DB_POOL_MAX,
+                DB_POOL_INCREMENT, DB_POOL_PING_INTERVAL, DB_POOL_WAIT_TIMEOUT, DB_STMT_CACHE_SIZE,
+                CACHE_BUS, FETCH_ARRAYSIZE, call_timeout, get_connection, get_pool_stats, fetch_dataframe)
+from auth import LoginRateLimited, register_user, login
+from migrations import init_db, check_index_usage
+from cache import CATALOG_CACHE_TTL, get_catalog_cache, invalidate_catalog, get_cache_stats
 
-# Database configuration
-DB_USER = os.getenv("DB_USER", "new_user")
-DB_PASSWORD = os.getenv("DB_PASSWORD", "password")
-DB_HOST = os.getenv("DB_HOST", "localhost")
-DB_PORT = os.getenv("DB_PORT", "1521")
-DB_SERVICE = os.getenv("DB_SERVICE", "XEPDB1")
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
 
-def init_db():
-    try:
-        with oracledb.connect(user=DB_USER, password=DB_PASSWORD, dsn=f"{DB_HOST}:{DB_PORT}/{DB_SERVICE}") as conn:
-            with conn.cursor() as cursor:
-                # Create users table
-                try:
-                    cursor.execute("SELECT COUNT(*) FROM user_tables WHERE table_name = 'USERS'")
-                    (table_exists,) = cursor.fetchone()
-
-                    if not table_exists:
-                        cursor.execute('''
-                            CREATE TABLE users (
-                                user_id NUMBER GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
-                                username VARCHAR2(100) UNIQUE NOT NULL,
-                                password VARCHAR2(255) NOT NULL,
-                                user_type VARCHAR2(50) NOT NULL,
-                                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                            )
-                        ''')
-                except oracledb.DatabaseError as e:
-                    error, = e.args
-                    if error.code != 955:  # Table already exists
-                        raise
-                
-                # Create customer table
-                try:
-                    cursor.execute("SELECT COUNT(*) FROM user_tables WHERE table_name = 'CUSTOMER'")
-                    (table_exists,) = cursor.fetchone()
-
-                    if not table_exists:
-                        cursor.execute('''
-                        CREATE TABLE customer (
-                            customer_id NUMBER GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
-                            user_id NUMBER,
-                            name VARCHAR2(100) NOT NULL,
-                            email VARCHAR2(100),
-                            phone VARCHAR2(50),
-                            address VARCHAR2(200),
-                            street VARCHAR2(100),
-                            city VARCHAR2(100),
-                            id_number VARCHAR2(20),
-                            license VARCHAR2(20),
-                            CONSTRAINT fk_customer_user_id FOREIGN KEY (user_id) REFERENCES users(user_id)
-                        )
-                        ''')
-                except oracledb.DatabaseError as e:
-                    error, = e.args
-                    if error.code != 955:
-                        raise
-                
-                # Create employee table
-                try:
-                    cursor.execute("SELECT COUNT(*) FROM user_tables WHERE table_name = 'EMPLOYEE'")
-                    (table_exists,) = cursor.fetchone()
-
-                    if not table_exists:
-                        cursor.execute('''
-                        CREATE TABLE employee (
-                            emp_id NUMBER GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
-                            user_id NUMBER,
-                            name VARCHAR2(100) NOT NULL,
-                            email VARCHAR2(100),
-                            phone VARCHAR2(50),
-                            address VARCHAR2(200),
-                            street VARCHAR2(100),
-                            city VARCHAR2(100),
-                            CONSTRAINT fk_employee_user_id FOREIGN KEY (user_id) REFERENCES users(user_id)
-                        )
-                        ''')
-                except oracledb.DatabaseError as e:
-                    error, = e.args
-                    if error.code != 955:
-                        raise
-                
-                # Create car table
-                try:
-                    cursor.execute("SELECT COUNT(*) FROM user_tables WHERE table_name = 'CAR'")
-                    (table_exists,) = cursor.fetchone()
-
-                    if not table_exists:
-                        cursor.execute('''
-                        CREATE TABLE car (
-                            car_id NUMBER GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
-                            model VARCHAR2(100) NOT NULL,
-                            plate_no VARCHAR2(20) UNIQUE NOT NULL,
-                            daily_price NUMBER NOT NULL
-                        )
-                        ''')
-                except oracledb.DatabaseError as e:
-                    error, = e.args
-                    if error.code != 955:
-                        raise
-                
-                # Create reservation table
-                try:
-                    cursor.execute("SELECT COUNT(*) FROM user_tables WHERE table_name = 'RESERVE'")
-                    (table_exists,) = cursor.fetchone()
-
-                    if not table_exists:
-                        cursor.execute('''
-                        CREATE TABLE reserve (
-                            resv_id NUMBER GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
-                            customer_id NUMBER NOT NULL,
-                            car_id NUMBER NOT NULL,
-                            pickup_day DATE NOT NULL,
-                            reserve_date DATE DEFAULT CURRENT_DATE,
-                            status VARCHAR2(50) DEFAULT 'Pending',
-                            CONSTRAINT fk_reserve_customer FOREIGN KEY (customer_id) REFERENCES customer(customer_id),
-                            CONSTRAINT fk_reserve_car FOREIGN KEY (car_id) REFERENCES car(car_id)
-                        )
-                        ''')
-                except oracledb.DatabaseError as e:
-                    error, = e.args
-                    if error.code != 955:
-                        raise
-                
-                # Create payments table
-                try:
-                    cursor.execute("SELECT COUNT(*) FROM user_tables WHERE table_name = 'PAYMENTS'")
-                    (table_exists,) = cursor.fetchone()
-
-                    if not table_exists:
-                        cursor.execute('''
-                        CREATE TABLE payments (
-                            pay_id NUMBER GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
-                            customer_id NUMBER NOT NULL,
-                            amount NUMBER NOT NULL,
-                            pay_date DATE DEFAULT CURRENT_DATE,
-                            due_date DATE,
-                            method VARCHAR2(50),
-                            pay_status VARCHAR2(50) DEFAULT 'Pending',
-                            employee_id NUMBER,
-                            CONSTRAINT fk_payments_customer FOREIGN KEY (customer_id) REFERENCES customer(customer_id),
-                            CONSTRAINT fk_payments_employee FOREIGN KEY (employee_id) REFERENCES employee(emp_id)
-                        )
-                        ''')
-                except oracledb.DatabaseError as e:
-                    error, = e.args
-                    if error.code != 955:
-                        raise
-                
-                # Add trigger to check reservation date
-                try:
-                    cursor.execute("""
-                    CREATE OR REPLACE TRIGGER check_reservation_date
-                    BEFORE INSERT ON reserve
-                    FOR EACH ROW
-                    DECLARE
-                        v_days NUMBER;
-                    BEGIN
-                        v_days := :NEW.pickup_day - CURRENT_DATE;
-                        IF v_days < 0 THEN
-                            RAISE_APPLICATION_ERROR(-20001, 'Pickup date cannot be before current date');
-                        END IF;
-                    END;
-                    """)
-                except oracledb.DatabaseError as e:
-                    error, = e.args
-                    if error.code != 4081:  # Trigger already exists
-                        raise
-                
-                # Add this in init_db() function after other trigger creation
-                try:
-                    cursor.execute("""
-                    CREATE OR REPLACE TRIGGER payment_status_trigger
-                    FOR UPDATE OF pay_status ON payments
-                    COMPOUND TRIGGER
-                    
-                    -- Global variables for the trigger
-                    v_customer_id NUMBER;
-                    v_pay_id NUMBER;
-                    
-                    -- BEFORE EACH ROW section to capture values
-                    BEFORE EACH ROW IS
-                    BEGIN
-                        IF :NEW.pay_status = 'Paid' THEN
-                            v_customer_id := :NEW.customer_id;
-                            v_pay_id := :NEW.pay_id;
-                        END IF;
-                    END BEFORE EACH ROW;
-                    
-                    -- AFTER STATEMENT section to perform the update
-                    AFTER STATEMENT IS
-                    BEGIN
-                        IF v_customer_id IS NOT NULL THEN
-                            UPDATE reserve r
-                            SET r.status = 'Active'
-                            WHERE r.customer_id = v_customer_id
-                            AND r.status = 'Pending'
-                            AND EXISTS (
-                                SELECT 1 
-                                FROM payments p 
-                                WHERE p.customer_id = r.customer_id 
-                                AND p.pay_id = v_pay_id
-                            );
-                        END IF;
-                    END AFTER STATEMENT;
-                    
-                    END payment_status_trigger;
-                    """)
-                except oracledb.DatabaseError as e:
-                    error, = e.args
-                    if error.code != 4081:  # Trigger already exists
-                        raise
-                
-                # Insert sample cars if none exist
-                cursor.execute("SELECT COUNT(*) FROM car")
-                car_count, = cursor.fetchone()
-                
-                if car_count == 0:
-                    sample_cars = [
-                        ('Toyota Camry', 'ABC123', 50),
-                        ('Honda Accord', 'XYZ789', 55),
-                        ('Tesla Model 3', 'EV1234', 85),
-                        ('Ford Mustang', 'MST500', 75),
-                        ('Jeep Cherokee', 'JEP321', 65)
-                    ]
-                    
-                    cursor.executemany(
-                        "INSERT INTO car (model, plate_no, daily_price) VALUES (:1, :2, :3)",
-                        sample_cars
-                    )
-                
-                # Insert admin user if none exists
-                cursor.execute("SELECT COUNT(*) FROM users WHERE username = 'admin'")
-                admin_count, = cursor.fetchone()
-                
-                if admin_count == 0:
-                    admin_password = hash_password('admin123')
-                    cursor.execute(
-                        "INSERT INTO users (username, password, user_type) VALUES ('admin', :1, 'Employee')",
-                        [admin_password]
-                    )
-                    
-                    # Get the user_id for the admin
-                    cursor.execute("SELECT user_id FROM users WHERE username = 'admin'")
-                    admin_user_id, = cursor.fetchone()
-                    
-                    # Create an employee record for the admin
-                    cursor.execute(
-                        "INSERT INTO employee (user_id, name, email, phone, address) VALUES (:1, 'Admin User', 'admin@carental.com', '555-ADMIN', 'Main Office')",
-                        [admin_user_id]
-                    )
-                
-                # Add PL/SQL procedure for updating reservation status
-                try:#PLSQL procedure is applied
-                    cursor.execute("""
-                    CREATE OR REPLACE PROCEDURE update_reservation_status_proc (
-                        p_resv_id IN NUMBER,
-                        p_status IN VARCHAR2,
-                        p_success OUT NUMBER
-                    ) IS
-                    BEGIN
-                        UPDATE reserve 
-                        SET status = p_status
-                        WHERE resv_id = p_resv_id;
-                        
-                        IF SQL%ROWCOUNT > 0 THEN
-                            p_success := 1;
-                            COMMIT;
-                        ELSE
-                            p_success := 0;
-                            ROLLBACK;
-                        END IF;
-                    EXCEPTION
-                        WHEN OTHERS THEN
-                            p_success := 0;
-                            ROLLBACK;
-                    END;
-                    """)
-                except oracledb.DatabaseError as e:
-                    error, = e.args
-                    if error.code != 955:  # Procedure already exists
-                        raise
-                
-                # Add PL/SQL function for getting customer info
-                try:
-                    cursor.execute("""
-                    CREATE OR REPLACE FUNCTION get_customer_info_func (
-                        p_customer_id IN NUMBER
-                    ) RETURN SYS_REFCURSOR IS
-                        v_result SYS_REFCURSOR;
-                    BEGIN
-                        OPEN v_result FOR
-                            SELECT name, email, phone, address, street, city, 
-                                   id_number, license
-                            FROM customer
-                            WHERE customer_id = p_customer_id;
-                        RETURN v_result;
-                    END;
-                    """)
-                except oracledb.DatabaseError as e:
-                    error, = e.args
-                    if error.code != 955:  # Function already exists
-                        raise
-                
-                conn.commit()
-                
-    except oracledb.DatabaseError as e:
-        print(f"Database error: {e}")
-        raise
+MONITORED_TABLES = ["users", "customer", "employee", "car", "reserve", "payments"]
 
-# Authentication functions
-def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
+# Row-count samples taken by the performance page, oldest first
+@st.cache_resource
+def get_table_count_history():
+    return collections.deque(maxlen=120)
 
-def register_user(username, password, user_type):
-    dsn = f"{DB_HOST}:{DB_PORT}/{DB_SERVICE}"
-    
+def get_table_row_counts():
+    # Returns the current counts and the oldest kept sample as (time, counts)
     try:
-        with oracledb.connect(user=DB_USER, password=DB_PASSWORD, dsn=dsn) as conn:
+        with get_connection() as conn:
             with conn.cursor() as cursor:
-                user_id_var = cursor.var(oracledb.NUMBER)  # Create bind variable
-                cursor.execute(
-                    "INSERT INTO users (username, password, user_type) VALUES (:1, :2, :3) RETURNING user_id INTO :4",
-                    [username, hash_password(password), user_type, user_id_var]
-                )
-                user_id = user_id_var.getvalue()[0]  
-                conn.commit()
-                return user_id
-    except oracledb.IntegrityError:
-        return None
-
-def authenticate(username, password):
-    dsn = f"{DB_HOST}:{DB_PORT}/{DB_SERVICE}"
+                cursor.execute("SELECT " + ", ".join(f"(SELECT COUNT(*) FROM {table})" for table in MONITORED_TABLES) + " FROM dual")
+                counts = dict(zip(MONITORED_TABLES, cursor.fetchone()))
+    except oracledb.DatabaseError as e:
+        print(f"Error in get_table_row_counts: {e}")
+        return {}, None
     
-    try:
-        with oracledb.connect(user=DB_USER, password=DB_PASSWORD, dsn=dsn) as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(
-                    "SELECT user_id, user_type FROM users WHERE username = :1 AND password = :2",
-                    [username, hash_password(password)]
-                )
-                result = cursor.fetchone()
-                
-                if result:
-                    return {"user_id": result[0], "user_type": result[1]}
-                return None
-    except oracledb.DatabaseError:
-        return None
+    history = get_table_count_history()
+    history.append((time.time(), counts))
+    return counts, history[0]
 
 # Customer functions
 def register_customer(user_id, name, email, phone, address, street, city, id_number, license_number):
-    dsn = f"{DB_HOST}:{DB_PORT}/{DB_SERVICE}"
-    
     try:
-        with oracledb.connect(user=DB_USER, password=DB_PASSWORD, dsn=dsn) as conn:
+        with get_connection() as conn:
             with conn.cursor() as cursor:
                 # Create the bind variable for customer_id
                 customer_id_var = cursor.var(oracledb.NUMBER)
@@ -380,10 +72,8 @@ def register_customer(user_id, name, email, phone, address, street, city, id_num
         return None
 
 def get_customer_id_by_user_id(user_id):
-    dsn = f"{DB_HOST}:{DB_PORT}/{DB_SERVICE}"
-    
     try:
-        with oracledb.connect(user=DB_USER, password=DB_PASSWORD, dsn=dsn) as conn:
+        with get_connection() as conn:
             with conn.cursor() as cursor:
                 cursor.execute("SELECT customer_id FROM customer WHERE user_id = :1", [user_id])
                 result = cursor.fetchone()
@@ -395,10 +85,8 @@ def get_customer_id_by_user_id(user_id):
         return None
 
 def get_employee_id_by_user_id(user_id):
-    dsn = f"{DB_HOST}:{DB_PORT}/{DB_SERVICE}"
-    
     try:
-        with oracledb.connect(user=DB_USER, password=DB_PASSWORD, dsn=dsn) as conn:
+        with get_connection() as conn:
             with conn.cursor() as cursor:
                 cursor.execute("SELECT emp_id FROM employee WHERE user_id = :1", [user_id])
                 result = cursor.fetchone()
@@ -411,10 +99,8 @@ def get_employee_id_by_user_id(user_id):
 #PLSQL function is applied here
 
 def get_customer_info(customer_id):
-    dsn = f"{DB_HOST}:{DB_PORT}/{DB_SERVICE}"
-    
     try:
-        with oracledb.connect(user=DB_USER, password=DB_PASSWORD, dsn=dsn) as conn:
+        with get_connection() as conn:
             with conn.cursor() as cursor:
                 # Call the PL/SQL function using REF CURSOR
                 ref_cursor = cursor.callfunc(
@@ -443,10 +129,8 @@ def get_customer_info(customer_id):
         return None
 
 def get_employee_info(emp_id):
-    dsn = f"{DB_HOST}:{DB_PORT}/{DB_SERVICE}"
-    
     try:
-        with oracledb.connect(user=DB_USER, password=DB_PASSWORD, dsn=dsn) as conn:
+        with get_connection() as conn:
             with conn.cursor() as cursor:
                 cursor.execute('''
                 SELECT name, email, phone, address, street, city
@@ -471,10 +155,8 @@ def get_employee_info(emp_id):
         return None
 
 def register_employee(user_id, name, email, phone, address, street, city):
-    dsn = f"{DB_HOST}:{DB_PORT}/{DB_SERVICE}"
-    
     try:
-        with oracledb.connect(user=DB_USER, password=DB_PASSWORD, dsn=dsn) as conn:
+        with get_connection() as conn:
             with conn.cursor() as cursor:
                 # Create bind variable for emp_id
                 emp_id_var = cursor.var(oracledb.NUMBER)
@@ -494,234 +176,785 @@ def register_employee(user_id, name, email, phone, address, street, city):
 
 #Sub query applied here
 
-def get_available_cars():
-    dsn = f"{DB_HOST}:{DB_PORT}/{DB_SERVICE}"
-    
+# Anti-join: one index probe per car on reserve (car_id, status), stopping at
+# the first active booking, instead of counting bookings twice per car.
+# active_bookings is kept in the result for callers; it is 0 by definition.
+AVAILABLE_CARS_SQL = '''
+SELECT 
+    c.car_id,
+    c.model,
+    c.plate_no,
+    c.daily_price,
+    0 as active_bookings
+FROM car c
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM reserve r
+    WHERE r.car_id = c.car_id
+    AND r.status = 'Active'
+)
+ORDER BY c.daily_price
+'''
+
+AVAILABLE_CARS_COLUMNS = ['car_id', 'model', 'plate_no', 'daily_price', 'active_bookings']
+
+# Reservations in these states hold the car for their pickup..return days
+BLOCKING_STATUSES = ("Pending", "Active")
+
+# Cars with no blocking reservation overlapping [:1, :2] (dates as YYYY-MM-DD)
+AVAILABLE_CARS_IN_RANGE_SQL = '''
+SELECT 
+    c.car_id,
+    c.model,
+    c.plate_no,
+    c.daily_price,
+    0 as active_bookings
+FROM car c
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM reserve r
+    WHERE r.car_id = c.car_id
+    AND r.status IN ('Pending', 'Active')
+    AND r.pickup_day <= TO_DATE(:2, 'YYYY-MM-DD')
+    AND r.return_day >= TO_DATE(:1, 'YYYY-MM-DD')
+)
+ORDER BY c.daily_price
+'''
+
+# Availability snapshot (off by default). A background thread per process
+# keeps every car's pending and active bookings in memory and reloads the
+# cars named in change_log every AVAILABILITY_REFRESH_INTERVAL seconds.
+AVAILABILITY_REFRESH_INTERVAL = float(os.getenv("AVAILABILITY_REFRESH_INTERVAL", "0"))  # 0 disables the snapshot
+# Reads fall back to SQL when the last successful poll is older than this.
+# It is not the staleness bound: a booking shows up within one refresh
+# interval unless its transaction commits more than AVAILABILITY_CHANGE_OVERLAP
+# seconds after writing its change_log row. Such a change is only picked up by
+# the next rebuild, up to AVAILABILITY_REBUILD_INTERVAL later.
+AVAILABILITY_MAX_STALENESS = float(os.getenv("AVAILABILITY_MAX_STALENESS", "30"))
+# Change ids can commit out of order, so every poll also re-reads the changes
+# logged in this many seconds before the newest one it has seen
+AVAILABILITY_CHANGE_OVERLAP = float(os.getenv("AVAILABILITY_CHANGE_OVERLAP", "30"))
+AVAILABILITY_REBUILD_INTERVAL = float(os.getenv("AVAILABILITY_REBUILD_INTERVAL", "300"))
+CHANGE_LOG_RETENTION = float(os.getenv("CHANGE_LOG_RETENTION", "3600"))
+
+SNAPSHOT_CARS_SQL = '''
+SELECT car_id, model, plate_no, daily_price, 0 as active_bookings
+FROM car
+ORDER BY daily_price
+'''
+
+# Bookings that ended before today can never overlap a new search, but an
+# Active one still makes its car unavailable right now
+SNAPSHOT_BOOKINGS_SQL = '''
+SELECT car_id,
+       TO_CHAR(pickup_day, 'YYYY-MM-DD') as pickup_day,
+       TO_CHAR(return_day, 'YYYY-MM-DD') as return_day,
+       status
+FROM reserve
+WHERE status IN ('Pending', 'Active')
+AND (return_day >= TO_DATE(:1, 'YYYY-MM-DD') OR status = 'Active')
+'''
+
+class CarIntervalIndex:
+    # Per car: booked intervals sorted by start, plus the running maximum of
+    # their end days, so "does anything overlap [start, end]" is one bisect.
+    # Days are YYYY-MM-DD strings, which sort chronologically.
+    def __init__(self, cars, bookings):
+        self.cars = cars
+        self.intervals = {}
+        self.starts = {}
+        self.max_ends = {}
+        self.active = {}
+        self.update_cars(set(), bookings)
+    
+    def update_cars(self, car_ids, bookings):
+        # Replaces the bookings of car_ids (and of any car in bookings) with bookings
+        by_car = {car_id: [] for car_id in car_ids}
+        for car_id, pickup_day, return_day, status in bookings:
+            by_car.setdefault(car_id, []).append((pickup_day, return_day or pickup_day, status))
+        for car_id, car_bookings in by_car.items():
+            for table in (self.intervals, self.starts, self.max_ends, self.active):
+                table.pop(car_id, None)
+            if not car_bookings:
+                continue
+            
+            car_intervals = sorted((start, end) for start, end, _ in car_bookings)
+            running_max = []
+            for _, end in car_intervals:
+                running_max.append(max(end, running_max[-1]) if running_max else end)
+            self.intervals[car_id] = car_intervals
+            self.starts[car_id] = [start for start, _ in car_intervals]
+            self.max_ends[car_id] = running_max
+            active = sum(1 for *_, status in car_bookings if status == "Active")
+            if active:
+                self.active[car_id] = active
+
+    def is_free(self, car_id, start_day, end_day):
+        starts = self.starts.get(car_id)
+        if not starts:
+            return True
+        # Intervals starting on or before end_day are the only overlap candidates
+        count = bisect.bisect_right(starts, end_day)
+        return count == 0 or self.max_ends[car_id][count - 1] < start_day
+
+    def free_cars(self, start_day, end_day):
+        free = [self.is_free(car_id, start_day, end_day) for car_id in self.cars["car_id"].tolist()]
+        return self.cars[free]
+    
+    def available_now(self):
+        # Same rule as AVAILABLE_CARS_SQL: no Active reservation
+        free = [car_id not in self.active for car_id in self.cars["car_id"].tolist()]
+        return self.cars[free]
+    
+    def next_free_day(self, car_id, today):
+        # First day from today not covered by a booking of this car
+        day = today
+        for start, end in self.intervals.get(car_id, []):
+            if start > day:
+                break
+            if end >= day:
+                day = (datetime.date.fromisoformat(end) + timedelta(days=1)).isoformat()
+        return day
+
+def claim_job(conn, job_name, interval):
+    # True for the one caller that moves the job's lease forward; everyone
+    # else sees it held until the interval has passed. Commits the claim.
+    now = time.time()
+    with conn.cursor() as cursor:
+        cursor.execute('''
+        UPDATE job_lease
+        SET leased_until = :1
+        WHERE job_name = :2
+        AND leased_until < :3
+        ''', [now + interval, job_name, now])
+        claimed = cursor.rowcount == 1
+    conn.commit()
+    return claimed
+
+class AvailabilitySnapshot:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.index = None
+        self.available = None
+        self.last_change_id = 0
+        self.last_changed_at = 0
+        self.refreshed_at = 0.0
+        self.rebuilt_at = 0.0
+        self.thread = threading.Thread(target=self.run, name="availability-snapshot", daemon=True)
+        self.thread.start()
+    
+    def run(self):
+        background_task.set("availability-snapshot")
+        while True:
+            try:
+                with get_connection() as conn:
+                    if time.time() - self.rebuilt_at >= AVAILABILITY_REBUILD_INTERVAL:
+                        self.rebuild(conn)
+                    else:
+                        self.apply_changes(conn)
+                self.refreshed_at = time.time()
+            except oracledb.DatabaseError as e:
+                print(f"Error in availability snapshot refresh: {e}")
+            
+            self.wake.wait(AVAILABILITY_REFRESH_INTERVAL)
+            self.wake.clear()
+    
+    def rebuild(self, conn):
+        today = datetime.date.today().strftime('%Y-%m-%d')
+        with conn.cursor() as cursor:
+            # Read the high-water mark first: changes that commit during the
+            # load are then applied again on the next poll, which is harmless
+            cursor.execute("SELECT NVL(MAX(change_id), 0), NVL(MAX(changed_at), 0) FROM change_log")
+            last_change_id, last_changed_at = cursor.fetchone()
+            
+            cars = fetch_dataframe(conn, SNAPSHOT_CARS_SQL, None, AVAILABLE_CARS_COLUMNS)
+            cursor.arraysize = FETCH_ARRAYSIZE
+            cursor.execute(SNAPSHOT_BOOKINGS_SQL, [today])
+            index = CarIntervalIndex(cars, cursor.fetchall())
+            
+            # One worker per interval purges; older rows are covered by the rebuilds
+            if claim_job(conn, "change_log_purge", AVAILABILITY_REBUILD_INTERVAL):
+                cursor.execute("DELETE FROM change_log WHERE changed_at < :1", [time.time() - CHANGE_LOG_RETENTION])
+                conn.commit()
+        
+        with self.lock:
+            self.index = index
+            self.available = None
+            self.last_change_id = last_change_id
+            self.last_changed_at = last_changed_at
+        self.rebuilt_at = time.time()
+    
+    def apply_changes(self, conn):
+        # New changes, plus the overlap window again for any that committed
+        # after a later change id was read; reloading a car twice is harmless
+        overlap_from = self.last_changed_at - AVAILABILITY_CHANGE_OVERLAP
+        with conn.cursor() as cursor:
+            cursor.execute('''
+            SELECT change_id, table_name, car_id, changed_at
+            FROM change_log
+            WHERE change_id > :1 OR changed_at >= :2
+            ORDER BY change_id
+            ''', [self.last_change_id, overlap_from])
+            changes = cursor.fetchall()
+            if not changes:
+                return
+            
+            last_change_id = max(self.last_change_id, changes[-1][0])
+            last_changed_at = max(self.last_changed_at, max(row[3] for row in changes))
+            cars = None
+            if any(row[1] == "CAR" for row in changes):
+                cars = fetch_dataframe(conn, SNAPSHOT_CARS_SQL, None, AVAILABLE_CARS_COLUMNS)
+            
+            # Reload just the changed cars' bookings
+            car_ids = {row[2] for row in changes if row[1] == "RESERVE"}
+            bookings = []
+            if car_ids:
+                cursor.arraysize = FETCH_ARRAYSIZE
+                cursor.execute(SNAPSHOT_BOOKINGS_SQL + '''
+                AND car_id IN (SELECT car_id FROM change_log WHERE change_id > :2 OR changed_at >= :3)
+                ''', [datetime.date.today().strftime('%Y-%m-%d'), self.last_change_id, overlap_from])
+                bookings = cursor.fetchall()
+        
+        with self.lock:
+            if cars is not None:
+                self.index.cars = cars
+            self.index.update_cars(car_ids, bookings)
+            self.available = None
+            self.last_change_id = last_change_id
+            self.last_changed_at = last_changed_at
+    
+    def is_fresh(self):
+        return self.index is not None and time.time() - self.refreshed_at <= AVAILABILITY_MAX_STALENESS
+    
+    def available_now(self):
+        # Computed once per change, not per read
+        with self.lock:
+            if self.available is None:
+                self.available = self.index.available_now()
+            return self.available
+    
+    def free_cars(self, start_day, end_day):
+        with self.lock:
+            return self.index.free_cars(start_day, end_day)
+    
+    def car_status(self):
+        # DataFrame of car_id, active_bookings, next_free_day for every car
+        today = datetime.date.today().strftime('%Y-%m-%d')
+        with self.lock:
+            car_ids = self.index.cars["car_id"].tolist()
+            return pd.DataFrame({
+                "car_id": car_ids,
+                "active_bookings": [self.index.active.get(car_id, 0) for car_id in car_ids],
+                "next_free_day": [self.index.next_free_day(car_id, today) for car_id in car_ids]
+            })
+
+# One snapshot and refresher thread per process
+@st.cache_resource
+def get_availability_snapshot():
+    return AvailabilitySnapshot()
+
+def get_fresh_availability_snapshot():
+    # The snapshot if it may serve reads, else None (callers use SQL)
+    if AVAILABILITY_REFRESH_INTERVAL <= 0:
+        return None
+    snapshot = get_availability_snapshot()
+    return snapshot if snapshot.is_fresh() else None
+
+# Cross-worker cache invalidation (CACHE_BUS): local evicts in this process
+# only, cqn uses Oracle change notification (Thick mode), file tails a shared
+# file for workers on one host
+CACHE_BUS_FILE = os.getenv("CACHE_BUS_FILE", "cache_bus.log")
+CACHE_BUS_POLL_INTERVAL = float(os.getenv("CACHE_BUS_POLL_INTERVAL", "0.5"))
+CACHE_BUS_MAX_BYTES = int(os.getenv("CACHE_BUS_MAX_BYTES", "1048576"))
+# Catalog TTL while the cqn subscription is down and being re-established
+CACHE_BUS_FALLBACK_TTL = float(os.getenv("CACHE_BUS_FALLBACK_TTL", "5"))
+
+# Catalog entries built from each table's rows
+CACHE_KEYS_BY_TABLE = {
+    "car": ("all_cars", "available_cars"),
+    "reserve": ("available_cars",),
+    # Paying activates the reservation (payment_status_trigger)
+    "payments": ("available_cars",)
+}
+
+def apply_table_change(table_name):
+    keys = CACHE_KEYS_BY_TABLE.get(table_name)
+    if not keys:
+        return
+    invalidate_catalog(*keys)
+    # The snapshot polls change_log itself; this just saves waiting a poll
+    if AVAILABILITY_REFRESH_INTERVAL > 0:
+        get_availability_snapshot().wake.set()
+
+class FileInvalidationBus:
+    # One "pid table" line per change. Past CACHE_BUS_MAX_BYTES the file is
+    # renamed to <path>.1, which readers finish before the new one.
+    def __init__(self, path):
+        self.path = path
+        with open(path, "a"):
+            pass
+        stat = os.stat(path)
+        self.inode = stat.st_ino
+        self.position = stat.st_size
+        self.received = 0
+        self.thread = threading.Thread(target=self.run, name="cache-bus", daemon=True)
+        self.thread.start()
+    
+    def publish(self, table_name):
+        with open(self.path, "a") as f:
+            f.write(f"{os.getpid()} {table_name}\n")
+            f.flush()
+            stat = os.fstat(f.fileno())
+        # Rotate only the file just written, in case another worker beat us to it
+        if stat.st_size > CACHE_BUS_MAX_BYTES and os.stat(self.path).st_ino == stat.st_ino:
+            os.replace(self.path, self.path + ".1")
+    
+    def read_from(self, path, inode):
+        # New complete lines of the file at path, if it is still the file we follow
+        try:
+            with open(path, "rb") as f:
+                if os.fstat(f.fileno()).st_ino != inode:
+                    return b""
+                f.seek(self.position)
+                data = f.read()
+        except FileNotFoundError:
+            return b""
+        # Leave a partly written last line for the next read
+        data = data[:data.rfind(b"\n") + 1]
+        self.position += len(data)
+        return data
+    
+    def poll(self):
+        with open(self.path, "a"):
+            pass  # Recreate it if it was rotated with nobody publishing since
+        data = b""
+        inode = os.stat(self.path).st_ino
+        if inode != self.inode:
+            data = self.read_from(self.path + ".1", self.inode)
+            self.inode, self.position = inode, 0
+        data += self.read_from(self.path, self.inode)
+        
+        tables = set()
+        for line in data.decode(errors="replace").splitlines():
+            try:
+                pid, table_name = line.split()
+                # This process evicted its own changes when it published them
+                if int(pid) != os.getpid():
+                    tables.add(table_name)
+            except ValueError:
+                print(f"Error in cache bus: skipping malformed line {line!r}")
+        return tables
+    
+    def run(self):
+        # Nothing may end this loop: a dead listener would leave the worker stale
+        while True:
+            time.sleep(CACHE_BUS_POLL_INTERVAL)
+            try:
+                tables = self.poll()
+            except OSError as e:
+                print(f"Error in cache bus: {e}")
+                continue
+            for table_name in tables:
+                try:
+                    apply_table_change(table_name)
+                    self.received += 1
+                except Exception as e:
+                    print(f"Error in cache bus: evicting {table_name}: {e}")
+
+class CqnInvalidationBus:
+    # Committed DML on a registered table calls notify() on a driver thread
+    def __init__(self):
+        self.received = 0
+        self.conn = None
+        self.subscription = None
+        try:
+            self.subscribe()
+        except oracledb.DatabaseError as e:
+            print(f"Error in cache bus: subscribing: {e}")
+            self.start_resubscribe()
+    
+    def subscribe(self):
+        conn = oracledb.connect(
+            user=DB_USER,
+            password=DB_PASSWORD,
+            dsn=f"{DB_HOST}:{DB_PORT}/{DB_SERVICE}",
+            events=True
+        )
+        subscription = conn.subscribe(
+            namespace=oracledb.SUBSCR_NAMESPACE_DBCHANGE,
+            operations=oracledb.OPCODE_ALLOPS,
+            qos=oracledb.SUBSCR_QOS_RELIABLE,
+            callback=self.notify,
+            client_initiated=True
+        )
+        for table_name in CACHE_KEYS_BY_TABLE:
+            subscription.registerquery(f"SELECT * FROM {table_name}")
+        
+        old_conn = self.conn
+        self.conn, self.subscription = conn, subscription
+        if old_conn:
+            try:
+                old_conn.close()
+            except oracledb.DatabaseError:
+                pass
+    
+    def start_resubscribe(self):
+        threading.Thread(target=self.resubscribe, name="cache-bus-resubscribe", daemon=True).start()
+    
+    def resubscribe(self):
+        # Short TTL while unsubscribed; changes made in the gap are missed,
+        # so clear again once it is back
+        cache = get_catalog_cache()
+        cache.ttl = min(CACHE_BUS_FALLBACK_TTL, CATALOG_CACHE_TTL)
+        cache.invalidate()
+        delay = 1
+        while True:
+            try:
+                self.subscribe()
+                break
+            except oracledb.DatabaseError as e:
+                print(f"Error in cache bus: resubscribing: {e}")
+                time.sleep(delay)
+                delay = min(delay * 2, 60)
+        cache.invalidate()
+        cache.ttl = CATALOG_CACHE_TTL
+    
+    def publish(self, table_name):
+        # The database notifies every subscriber, this process included
+        pass
+    
+    def notify(self, message):
+        if message.type == oracledb.EVENT_DEREG:
+            print("Error in cache bus: change notification subscription ended, resubscribing")
+            self.start_resubscribe()
+            return
+        for table in message.tables:
+            # Names arrive as SCHEMA.TABLE
+            apply_table_change(table.name.split(".")[-1].lower())
+            self.received += 1
+
+# One listener per process
+@st.cache_resource
+def get_invalidation_bus():
+    if CACHE_BUS == "cqn":
+        if DB_BACKEND == "sqlite":
+            print("Error in get_invalidation_bus: change notification needs Oracle, invalidating locally")
+            return None
+        return CqnInvalidationBus()
+    if CACHE_BUS == "file":
+        return FileInvalidationBus(CACHE_BUS_FILE)
+    return None
+
+def publish_change(*table_names):
+    # After a committed write: evict in this process straight away, then let
+    # the other workers know. A bus failure never fails the write.
+    for table_name in table_names:
+        apply_table_change(table_name)
     try:
-        with oracledb.connect(user=DB_USER, password=DB_PASSWORD, dsn=dsn) as conn:
-            with conn.cursor() as cursor:
-                # Simple subquery to get available cars
-                cursor.execute('''
-                SELECT 
-                    car_id,
-                    model,
-                    plate_no,
-                    daily_price,
-                    (SELECT COUNT(*) 
-                     FROM reserve r 
-                     WHERE r.car_id = c.car_id 
-                     AND r.status = 'Active') as active_bookings
-                FROM car c
-                WHERE (SELECT COUNT(*) 
-                      FROM reserve r 
-                      WHERE r.car_id = c.car_id 
-                      AND r.status = 'Active') = 0
-                ORDER BY daily_price
-                ''')
-                
-                columns = ['car_id', 'model', 'plate_no', 'daily_price', 'active_bookings']
-                result = []
-                for row in cursor:
-                    result.append(dict(zip(columns, row)))
-                
-                return result
+        bus = get_invalidation_bus()
+        if bus:
+            for table_name in table_names:
+                bus.publish(table_name)
+    except (OSError, oracledb.DatabaseError) as e:
+        print(f"Error in publish_change: {e}")
+
+def load_available_cars(start_day=None, end_day=None):
+    with get_connection() as conn:
+        if start_day and end_day:
+            return fetch_dataframe(conn, AVAILABLE_CARS_IN_RANGE_SQL, [start_day, end_day], AVAILABLE_CARS_COLUMNS)
+        return fetch_dataframe(conn, AVAILABLE_CARS_SQL, None, AVAILABLE_CARS_COLUMNS)
+
+def get_available_cars(start_day=None, end_day=None):
+    # Without dates: cars with no active booking right now.
+    # With dates: cars with no pending/active booking overlapping start_day..end_day.
+    # Served from the availability snapshot when it is fresh.
+    try:
+        snapshot = get_fresh_availability_snapshot()
+        if start_day and end_day:
+            if snapshot:
+                return snapshot.free_cars(start_day, end_day)
+            return load_available_cars(start_day, end_day)
+        
+        if snapshot:
+            return snapshot.available_now()
+        return get_catalog_cache().get(("available_cars",), load_available_cars)
     except oracledb.DatabaseError as e:
         print(f"Error in get_available_cars: {e}")
-        return []
+        return pd.DataFrame(columns=AVAILABLE_CARS_COLUMNS)
+
+# Booking retries: lock timeouts and deadlocks are retried with jittered
+# exponential backoff; a genuine date overlap (ORA-20002) is not
+BOOKING_MAX_ATTEMPTS = int(os.getenv("BOOKING_MAX_ATTEMPTS", "5"))
+BOOKING_BACKOFF_BASE = float(os.getenv("BOOKING_BACKOFF_BASE", "0.05"))
+BOOKING_RETRY_CODES = (54, 60, 30006)  # resource busy, deadlock, lock wait timed out
+BOOKING_CONFLICT_CODE = 20002
 
-def make_reservation(customer_id, car_id, pickup_day):
-    dsn = f"{DB_HOST}:{DB_PORT}/{DB_SERVICE}"
+def book_car(customer_id, car_id, pickup_day, return_day):
+    # Returns (resv_id, pay_id). Raises oracledb.DatabaseError on a booking
+    # conflict or once the retries are used up.
+    for attempt in range(1, BOOKING_MAX_ATTEMPTS + 1):
+        try:
+            with get_connection() as conn:
+                with conn.cursor() as cursor:
+                    resv_id_var = cursor.var(int)
+                    pay_id_var = cursor.var(int)
+                    
+                    # Locks the car, checks for overlaps, books, prices and
+                    # bills it in one round trip; the procedure commits
+                    cursor.callproc("book_car_proc", [
+                        customer_id, car_id,
+                        datetime.date.fromisoformat(pickup_day),
+                        datetime.date.fromisoformat(return_day),
+                        resv_id_var, pay_id_var
+                    ])
+                    
+                    publish_change("reserve", "payments")
+                    return resv_id_var.getvalue(), pay_id_var.getvalue()
+        except oracledb.DatabaseError as e:
+            error, = e.args
+            if error.code not in BOOKING_RETRY_CODES or attempt == BOOKING_MAX_ATTEMPTS:
+                raise
+        
+        time.sleep(random.uniform(0, BOOKING_BACKOFF_BASE * 2 ** (attempt - 1)))
+
+def make_reservation(customer_id, car_id, pickup_day, return_day=None):
+    # Dates are YYYY-MM-DD strings; a missing return day means a one-day rental
+    return_day = return_day or pickup_day
+    if return_day < pickup_day:
+        print("Error in make_reservation: return day is before pickup day")
+        return None
     
     try:
-        with oracledb.connect(user=DB_USER, password=DB_PASSWORD, dsn=dsn) as conn:
-            with conn.cursor() as cursor:
-                # Create a bind variable for resv_id
-                resv_id_var = cursor.var(oracledb.NUMBER)
-                
-                # Insert the reservation
-                cursor.execute('''
-                    INSERT INTO reserve 
-                    (customer_id, car_id, pickup_day) 
-                    VALUES (:1, :2, TO_DATE(:3, 'YYYY-MM-DD'))
-                    RETURNING resv_id INTO :4
-                ''', [customer_id, car_id, pickup_day, resv_id_var])
-                
-                resv_id = resv_id_var.getvalue()[0]
-                
-                # Get car price
-                cursor.execute("SELECT daily_price FROM car WHERE car_id = :1", [car_id])
-                daily_price, = cursor.fetchone()
-                
-                # Create payment record
-                pay_id_var = cursor.var(oracledb.NUMBER)
-                due_date = (datetime.datetime.strptime(pickup_day, '%Y-%m-%d') + datetime.timedelta(days=1)).strftime('%Y-%m-%d')
-                
-                cursor.execute('''
-                    INSERT INTO payments
-                    (customer_id, amount, due_date)
-                    VALUES (:1, :2, TO_DATE(:3, 'YYYY-MM-DD'))
-                    RETURNING pay_id INTO :4
-                ''', [customer_id, daily_price, due_date, pay_id_var])
-                
-                conn.commit()
-                return resv_id
+        resv_id, pay_id = book_car(customer_id, car_id, pickup_day, return_day)
+        return resv_id
     except oracledb.DatabaseError as e:
         print(f"Error in make_reservation: {e}")
         return None
 
+# List queries shared by the sync readers below and their async counterparts
+CUSTOMER_RESERVATIONS_SQL = '''
+SELECT 
+    r.resv_id,
+    r.car_id,
+    c.model,
+    c.plate_no,
+    c.daily_price,
+    TO_CHAR(r.pickup_day, 'YYYY-MM-DD') as pickup_day,
+    TO_CHAR(r.return_day, 'YYYY-MM-DD') as return_day,
+    TO_CHAR(r.reserve_date, 'YYYY-MM-DD') as reserve_date,
+    r.status
+FROM reserve r
+JOIN car c ON r.car_id = c.car_id
+WHERE r.customer_id = :1
+ORDER BY r.pickup_day DESC
+'''
+CUSTOMER_RESERVATIONS_COLUMNS = ['resv_id', 'car_id', 'model', 'plate_no', 'daily_price', 
+                                 'pickup_day', 'return_day', 'reserve_date', 'status']
+
+CUSTOMER_PAYMENTS_SQL = '''
+SELECT p.pay_id, p.amount, 
+       TO_CHAR(p.pay_date, 'YYYY-MM-DD') as pay_date,
+       TO_CHAR(p.due_date, 'YYYY-MM-DD') as due_date,
+       p.method, p.pay_status,
+       COALESCE(e.name, 'Not Assigned') as employee_name
+FROM payments p
+LEFT JOIN employee e ON p.employee_id = e.emp_id
+WHERE p.customer_id = :1
+ORDER BY p.pay_date DESC
+'''
+CUSTOMER_PAYMENTS_COLUMNS = ['pay_id', 'amount', 'pay_date', 'due_date', 
+                             'method', 'pay_status', 'employee_name']
+
+# {limit_clause} is empty or FETCH FIRST :1 ROWS ONLY
+PENDING_PAYMENTS_SQL = '''
+SELECT p.pay_id, c.name as customer_name, p.amount, 
+       TO_CHAR(p.pay_date, 'YYYY-MM-DD') as pay_date,
+       TO_CHAR(p.due_date, 'YYYY-MM-DD') as due_date,
+       p.pay_status
+FROM payments p
+JOIN customer c ON p.customer_id = c.customer_id
+WHERE p.pay_status = 'Pending'
+ORDER BY p.due_date
+{limit_clause}
+'''
+PENDING_PAYMENTS_COLUMNS = ['pay_id', 'customer_name', 'amount', 'pay_date', 
+                            'due_date', 'pay_status']
+
+ALL_RESERVATIONS_SQL = '''
+SELECT r.resv_id, c.name as customer_name, 
+       car.model, car.plate_no,
+       TO_CHAR(r.pickup_day, 'YYYY-MM-DD') as pickup_day,
+       TO_CHAR(r.return_day, 'YYYY-MM-DD') as return_day,
+       TO_CHAR(r.reserve_date, 'YYYY-MM-DD') as reserve_date,
+       r.status
+FROM reserve r
+JOIN customer c ON r.customer_id = c.customer_id
+JOIN car ON r.car_id = car.car_id
+ORDER BY r.reserve_date DESC
+'''
+ALL_RESERVATIONS_COLUMNS = ['resv_id', 'customer_name', 'model', 'plate_no', 
+                            'pickup_day', 'return_day', 'reserve_date', 'status']
+
+def pending_payments_query(limit=None):
+    # limit returns only the payments due soonest
+    if limit:
+        return PENDING_PAYMENTS_SQL.format(limit_clause="FETCH FIRST :1 ROWS ONLY"), [limit]
+    return PENDING_PAYMENTS_SQL.format(limit_clause=""), []
+
 #Join is applied
 def get_customer_reservations(customer_id):
-    dsn = f"{DB_HOST}:{DB_PORT}/{DB_SERVICE}"
-    
     try:
-        with oracledb.connect(user=DB_USER, password=DB_PASSWORD, dsn=dsn) as conn:
-            with conn.cursor() as cursor:
-                cursor.execute('''
-                SELECT 
-                    r.resv_id,
-                    r.car_id,
-                    c.model,
-                    c.plate_no,
-                    c.daily_price,
-                    TO_CHAR(r.pickup_day, 'YYYY-MM-DD') as pickup_day,
-                    TO_CHAR(r.reserve_date, 'YYYY-MM-DD') as reserve_date,
-                    r.status
-                FROM reserve r
-                JOIN car c ON r.car_id = c.car_id
-                WHERE r.customer_id = :1
-                ORDER BY r.pickup_day DESC
-                ''', [customer_id])
-                
-                columns = ['resv_id', 'car_id', 'model', 'plate_no', 'daily_price', 
-                          'pickup_day', 'reserve_date', 'status']
-                result = []
-                for row in cursor:
-                    result.append(dict(zip(columns, row)))
-                
-                return result
+        with get_connection() as conn:
+            return fetch_dataframe(conn, CUSTOMER_RESERVATIONS_SQL, [customer_id], CUSTOMER_RESERVATIONS_COLUMNS)
     except oracledb.DatabaseError as e:
         print(f"Error in get_customer_reservations: {e}")
-        return []
+        return pd.DataFrame(columns=CUSTOMER_RESERVATIONS_COLUMNS)
 
 def get_customer_payments(customer_id):
-    dsn = f"{DB_HOST}:{DB_PORT}/{DB_SERVICE}"
-    
     try:
-        with oracledb.connect(user=DB_USER, password=DB_PASSWORD, dsn=dsn) as conn:
-            with conn.cursor() as cursor:
-                cursor.execute('''
-                SELECT p.pay_id, p.amount, 
-                       TO_CHAR(p.pay_date, 'YYYY-MM-DD') as pay_date,
-                       TO_CHAR(p.due_date, 'YYYY-MM-DD') as due_date,
-                       p.method, p.pay_status,
-                       NVL(e.name, 'Not Assigned') as employee_name
-                FROM payments p
-                LEFT JOIN employee e ON p.employee_id = e.emp_id
-                WHERE p.customer_id = :1
-                ORDER BY p.pay_date DESC
-                ''', [customer_id])
-                
-                columns = ['pay_id', 'amount', 'pay_date', 'due_date', 
-                           'method', 'pay_status', 'employee_name']
-                
-                result = []
-                for row in cursor:
-                    result.append(dict(zip(columns, row)))
-                
-                return result
+        with get_connection() as conn:
+            return fetch_dataframe(conn, CUSTOMER_PAYMENTS_SQL, [customer_id], CUSTOMER_PAYMENTS_COLUMNS)
     except oracledb.DatabaseError as e:
         print(f"Error in get_customer_payments: {e}")
-        return []
+        return pd.DataFrame(columns=CUSTOMER_PAYMENTS_COLUMNS)
 
 #PLSQL Trigger applied here
 def process_payment(pay_id, method, employee_id):
-    dsn = f"{DB_HOST}:{DB_PORT}/{DB_SERVICE}"
-    
+    return process_payments([pay_id], method, employee_id) == 1
+
+def process_payments(pay_ids, method, employee_id):
+    # Settles every payment in one transaction with a single array update;
+    # payment_status_trigger activates each paid payment's reservation.
+    # Returns how many were still pending and got marked Paid
+    if not pay_ids:
+        return 0
     try:
-        with oracledb.connect(user=DB_USER, password=DB_PASSWORD, dsn=dsn) as conn:
+        with get_connection() as conn:
             with conn.cursor() as cursor:
-                # Simple update - trigger will handle reservation status
-                cursor.execute('''
+                # Trigger will handle reservation status
+                cursor.executemany('''
                     UPDATE payments
                     SET method = :1,
                         pay_status = 'Paid',
                         employee_id = :2,
                         pay_date = CURRENT_DATE
                     WHERE pay_id = :3
-                ''', [method, employee_id, pay_id])
+                    AND pay_status = 'Pending'
+                ''', [[method, employee_id, pay_id] for pay_id in pay_ids],
+                    arraydmlrowcounts=True)
+                settled = sum(cursor.getarraydmlrowcounts())
                 
                 conn.commit()
-                return True
+                # The trigger may have activated reservations
+                publish_change("payments")
+                return settled
                 
     except oracledb.DatabaseError as e:
-        print(f"Error in process_payment: {e}")
-        return False
+        print(f"Error in process_payments: {e}")
+        return 0
 
-def get_pending_payments():
-    dsn = f"{DB_HOST}:{DB_PORT}/{DB_SERVICE}"
-    
+def get_pending_payments(limit=None):
+    sql, params = pending_payments_query(limit)
     try:
-        with oracledb.connect(user=DB_USER, password=DB_PASSWORD, dsn=dsn) as conn:
-            with conn.cursor() as cursor:
-                cursor.execute('''
-                SELECT p.pay_id, c.name as customer_name, p.amount, 
-                       TO_CHAR(p.pay_date, 'YYYY-MM-DD') as pay_date,
-                       TO_CHAR(p.due_date, 'YYYY-MM-DD') as due_date,
-                       p.pay_status
-                FROM payments p
-                JOIN customer c ON p.customer_id = c.customer_id
-                WHERE p.pay_status = 'Pending'
-                ORDER BY p.due_date
-                ''')
-                
-                columns = ['pay_id', 'customer_name', 'amount', 'pay_date', 
-                           'due_date', 'pay_status']
-                
-                result = []
-                for row in cursor:
-                    result.append(dict(zip(columns, row)))
-                
-                return result
+        with get_connection() as conn:
+            return fetch_dataframe(conn, sql, params, PENDING_PAYMENTS_COLUMNS)
     except oracledb.DatabaseError as e:
         print(f"Error in get_pending_payments: {e}")
-        return []
+        return pd.DataFrame(columns=PENDING_PAYMENTS_COLUMNS)
 
 def get_all_reservations():
-    dsn = f"{DB_HOST}:{DB_PORT}/{DB_SERVICE}"
-    
     try:
-        with oracledb.connect(user=DB_USER, password=DB_PASSWORD, dsn=dsn) as conn:
+        with get_connection() as conn:
+            return fetch_dataframe(conn, ALL_RESERVATIONS_SQL, None, ALL_RESERVATIONS_COLUMNS)
+    except oracledb.DatabaseError as e:
+        print(f"Error in get_all_reservations: {e}")
+        return pd.DataFrame(columns=ALL_RESERVATIONS_COLUMNS)
+
+RESERVATIONS_PAGE_SIZE = 25
+
+def get_reservations_page(status=None, after=None, limit=RESERVATIONS_PAGE_SIZE):
+    # Keyset pagination, newest first. `after` is the next_cursor returned for
+    # the previous page; the result is (DataFrame, next_cursor), next_cursor None
+    # on the last page. Cost stays flat however deep the page is.
+    conditions = []
+    params = {"page_size": limit + 1}
+    if status:
+        conditions.append("r.status = :status")
+        params["status"] = status
+    if after:
+        conditions.append("(r.reserve_date < :after_date OR (r.reserve_date = :after_date AND r.resv_id < :after_id))")
+        params["after_date"], params["after_id"] = after
+    where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    
+    columns = ['resv_id', 'customer_name', 'model', 'plate_no', 
+               'pickup_day', 'return_day', 'reserve_date', 'status']
+    try:
+        with get_connection() as conn:
             with conn.cursor() as cursor:
-                cursor.execute('''
+                cursor.execute(f'''
                 SELECT r.resv_id, c.name as customer_name, 
                        car.model, car.plate_no,
                        TO_CHAR(r.pickup_day, 'YYYY-MM-DD') as pickup_day,
+                       TO_CHAR(r.return_day, 'YYYY-MM-DD') as return_day,
                        TO_CHAR(r.reserve_date, 'YYYY-MM-DD') as reserve_date,
-                       r.status
+                       r.status,
+                       r.reserve_date as reserve_key
                 FROM reserve r
                 JOIN customer c ON r.customer_id = c.customer_id
                 JOIN car ON r.car_id = car.car_id
-                ORDER BY r.reserve_date DESC
-                ''')
-                
-                columns = ['resv_id', 'customer_name', 'model', 'plate_no', 
-                           'pickup_day', 'reserve_date', 'status']
+                {where_clause}
+                ORDER BY r.reserve_date DESC, r.resv_id DESC
+                FETCH FIRST :page_size ROWS ONLY
+                ''', params)
                 
-                result = []
-                for row in cursor:
-                    result.append(dict(zip(columns, row)))
+                rows = cursor.fetchall()
+                next_cursor = None
+                if len(rows) > limit:
+                    rows = rows[:limit]
+                    next_cursor = (rows[-1][-1], rows[-1][0])
                 
-                return result
+                page = pd.DataFrame.from_records(rows, columns=columns + ['reserve_key'])
+                return page.drop(columns='reserve_key'), next_cursor
     except oracledb.DatabaseError as e:
-        print(f"Error in get_all_reservations: {e}")
-        return []
+        print(f"Error in get_reservations_page: {e}")
+        return pd.DataFrame(columns=columns), None
+
+# All employee dashboard counters in one aggregate statement
+DASHBOARD_STATS_SQL = '''
+SELECT
+    (SELECT COUNT(*) FROM reserve WHERE status = 'Active') as active_reservations,
+    (SELECT COUNT(*) FROM reserve WHERE status = 'Pending') as pending_reservations,
+    (SELECT COUNT(*) FROM payments WHERE pay_status = 'Pending') as pending_payments,
+    (SELECT COUNT(*) FROM car) as total_cars,
+    (SELECT COUNT(*)
+     FROM car c
+     WHERE NOT EXISTS (
+         SELECT 1
+         FROM reserve r
+         WHERE r.car_id = c.car_id
+         AND r.status = 'Active'
+     )) as available_cars
+FROM dual
+'''
+
+DASHBOARD_STATS = ['active_reservations', 'pending_reservations', 'pending_payments',
+                   'total_cars', 'available_cars']
+
+def get_dashboard_stats():
+    try:
+        with get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(DASHBOARD_STATS_SQL)
+                return dict(zip(DASHBOARD_STATS, cursor.fetchone()))
+    except oracledb.DatabaseError as e:
+        print(f"Error in get_dashboard_stats: {e}")
+        return dict.fromkeys(DASHBOARD_STATS, 0)
 
 #PLSQL PROCEDURE IS APPLIED
 def update_reservation_status(resv_id, status):
-    dsn = f"{DB_HOST}:{DB_PORT}/{DB_SERVICE}"
-    
     try:
-        with oracledb.connect(user=DB_USER, password=DB_PASSWORD, dsn=dsn) as conn:
+        with get_connection() as conn:
             with conn.cursor() as cursor:
                 # Create OUT parameter for success flag
                 success_var = cursor.var(oracledb.NUMBER)
@@ -732,6 +965,7 @@ def update_reservation_status(resv_id, status):
                 
                 # Commit the transaction
                 conn.commit()
+                publish_change("reserve")
                 
                 # Check if update was successful
                 return success_var.getvalue() == 1
@@ -741,10 +975,8 @@ def update_reservation_status(resv_id, status):
         return False
 
 def add_car(model, plate_no, daily_price):
-    dsn = f"{DB_HOST}:{DB_PORT}/{DB_SERVICE}"
-    
     try:
-        with oracledb.connect(user=DB_USER, password=DB_PASSWORD, dsn=dsn) as conn:
+        with get_connection() as conn:
             with conn.cursor() as cursor:
                 # Create a bind variable for car_id
                 car_id_var = cursor.var(oracledb.NUMBER)
@@ -758,42 +990,350 @@ def add_car(model, plate_no, daily_price):
                 
                 car_id = car_id_var.getvalue()[0]
                 conn.commit()
+                publish_change("car")
                 return car_id
     except oracledb.DatabaseError as e:
         print(f"Error in add_car: {e}")
         return None
 
-def get_all_cars():
-    dsn = f"{DB_HOST}:{DB_PORT}/{DB_SERVICE}"
+ALL_CARS_SQL = '''
+SELECT car_id, model, plate_no, daily_price
+FROM car
+ORDER BY model
+'''
+ALL_CARS_COLUMNS = ['car_id', 'model', 'plate_no', 'daily_price']
+
+# Bulk car import
+CAR_IMPORT_COLUMNS = ['model', 'plate_no', 'daily_price']
+CAR_IMPORT_CHUNK_SIZE = int(os.getenv("CAR_IMPORT_CHUNK_SIZE", "5000"))
+
+def read_car_chunks(source, file_format, chunk_size):
+    # source is a path or a file-like object (e.g. a Streamlit upload)
+    if file_format == "parquet":
+        if pyarrow is None:
+            raise ValueError("Parquet import needs pyarrow installed")
+        parquet_file = pyarrow.parquet.ParquetFile(source)
+        missing = set(CAR_IMPORT_COLUMNS) - set(parquet_file.schema_arrow.names)
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(sorted(missing))}")
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=CAR_IMPORT_COLUMNS):
+            # Text columns as strings, as in the CSV path; an all-digit plate_no column is int64
+            table = pyarrow.Table.from_batches([batch])
+            for name in ("model", "plate_no"):
+                table = table.set_column(table.schema.get_field_index(name), name, table[name].cast(pyarrow.string()))
+            yield table.to_pandas()
+    else:
+        for chunk in pd.read_csv(source, chunksize=chunk_size, dtype={"model": str, "plate_no": str}):
+            missing = set(CAR_IMPORT_COLUMNS) - set(chunk.columns)
+            if missing:
+                raise ValueError(f"Missing columns: {', '.join(sorted(missing))}")
+            yield chunk
+
+def validate_car_rows(chunk, first_row_number, seen_plates):
+    # Returns the insertable (row_number, model, plate_no, daily_price) rows
+    # and a failure entry for every rejected row
+    valid, failures = [], []
+    prices = pd.to_numeric(chunk["daily_price"], errors="coerce")
+    for offset, (model, plate_no, price) in enumerate(zip(chunk["model"], chunk["plate_no"], prices)):
+        row_number = first_row_number + offset
+        model = str(model).strip() if not pd.isna(model) else ""
+        # Stored exactly as given, like the Add Car form does
+        plate_no = str(plate_no) if not pd.isna(plate_no) else ""
+        if not model or not plate_no.strip():
+            reason = "model and plate_no are required"
+        elif pd.isna(price) or price <= 0:
+            reason = "daily_price must be a positive number"
+        elif plate_no in seen_plates:
+            reason = "plate_no already exists"
+        else:
+            seen_plates.add(plate_no)
+            valid.append((row_number, model, plate_no, float(price)))
+            continue
+        failures.append({"row": row_number, "plate_no": plate_no, "reason": reason})
+    return valid, failures
+
+def import_cars(source, file_format="csv", chunk_size=CAR_IMPORT_CHUNK_SIZE):
+    # Streams the file in chunks and loads each with one array insert.
+    # Rows the database rejects are reported instead of failing the chunk.
+    started = time.perf_counter()
+    inserted = 0
+    failures = []
     
     try:
-        with oracledb.connect(user=DB_USER, password=DB_PASSWORD, dsn=dsn) as conn:
+        with get_connection() as conn:
             with conn.cursor() as cursor:
-                cursor.execute('''
-                SELECT car_id, model, plate_no, daily_price
-                FROM car
-                ORDER BY model
-                ''')
-                
-                columns = ['car_id', 'model', 'plate_no', 'daily_price']
+                cursor.execute("SELECT plate_no FROM car")
+                # Matched exactly, like the car.plate_no unique constraint
+                seen_plates = {plate_no for plate_no, in cursor}
                 
-                result = []
-                for row in cursor:
-                    result.append(dict(zip(columns, row)))
-                
-                return result
+                row_number = 1
+                for chunk in read_car_chunks(source, file_format, chunk_size):
+                    valid, chunk_failures = validate_car_rows(chunk, row_number, seen_plates)
+                    failures.extend(chunk_failures)
+                    row_number += len(chunk)
+                    
+                    if not valid:
+                        continue
+                    
+                    cursor.executemany(
+                        "INSERT INTO car (model, plate_no, daily_price) VALUES (:1, :2, :3)",
+                        [row[1:] for row in valid],
+                        batcherrors=True
+                    )
+                    batch_errors = cursor.getbatcherrors()
+                    for error in batch_errors:
+                        failed = valid[error.offset]
+                        failures.append({"row": failed[0], "plate_no": failed[2], "reason": error.message})
+                    inserted += len(valid) - len(batch_errors)
+                    conn.commit()
+    finally:
+        # Chunks committed before a failure are still new cars
+        if inserted:
+            publish_change("car")
+    
+    elapsed = time.perf_counter() - started
+    return {
+        "inserted": inserted,
+        "failed": sorted(failures, key=lambda failure: failure["row"]),
+        "elapsed": elapsed,
+        "rows_per_second": inserted / elapsed if elapsed else 0.0
+    }
+
+def load_all_cars():
+    with get_connection() as conn:
+        return fetch_dataframe(conn, ALL_CARS_SQL, None, ALL_CARS_COLUMNS)
+
+def get_all_cars():
+    try:
+        return get_catalog_cache().get(("all_cars",), load_all_cars)
     except oracledb.DatabaseError as e:
         print(f"Error in get_all_cars: {e}")
-        return []
+        return pd.DataFrame(columns=ALL_CARS_COLUMNS)
+
+# Async data access on one background event loop; SQLite has no async
+# driver, so there reads run the sync path on a worker thread
+DB_ASYNC = os.getenv("DB_ASYNC", "0") == "1"
+
+# The asyncio pool is Thin mode only; CACHE_BUS=cqn needs Thick mode
+if DB_ASYNC and CACHE_BUS == "cqn":
+    raise ValueError("CACHE_BUS=cqn needs Thick mode and cannot be combined with DB_ASYNC=1")
+
+class AsyncRuntime:
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="db-async", daemon=True)
+        self.thread.start()
+        self.pool = None
+        if DB_BACKEND != "sqlite":
+            self.pool = self.submit(self.create_pool()).result()
+    
+    async def create_pool(self):
+        # Created on the loop thread, which every later acquire runs on
+        return oracledb.create_pool_async(
+            user=DB_USER,
+            password=DB_PASSWORD,
+            dsn=f"{DB_HOST}:{DB_PORT}/{DB_SERVICE}",
+            min=DB_POOL_MIN,
+            max=DB_POOL_MAX,
+            increment=DB_POOL_INCREMENT,
+            ping_interval=DB_POOL_PING_INTERVAL,
+            getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+            wait_timeout=DB_POOL_WAIT_TIMEOUT,
+            stmtcachesize=DB_STMT_CACHE_SIZE
+        )
+    
+    def submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+# One loop and async pool per process
+@st.cache_resource
+def get_async_runtime():
+    return AsyncRuntime()
 
+def submit_async(coro):
+    # Schedules coro on the background loop and returns a concurrent future.
+    # It runs with the caller's context variables (rerun counters, call timeout).
+    context = contextvars.copy_context()
+    
+    async def in_caller_context():
+        for var, value in context.items():
+            var.set(value)
+        return await coro
+    
+    return get_async_runtime().submit(in_caller_context())
+
+async def fetch_dataframe_async(sql, params=None, columns=None):
+    runtime = get_async_runtime()
+    if runtime.pool is None:
+        def fetch():
+            with get_connection() as conn:
+                return fetch_dataframe(conn, sql, params, columns)
+        return await asyncio.to_thread(fetch)
+    
+    count_rerun_stat("acquires")
+    metrics = get_query_metrics()
+    start = time.perf_counter()
+    conn = await runtime.pool.acquire()
+    conn.call_timeout = call_timeout.get()
+    acquire_time = time.perf_counter() - start
+    metrics.record_acquire(acquire_time)
+    record = new_query_record(sql, acquire_time)
+    del record["fetched"]
+    try:
+        with conn.cursor() as cursor:
+            cursor.arraysize = FETCH_ARRAYSIZE
+            cursor.prefetchrows = FETCH_ARRAYSIZE + 1
+            start = time.perf_counter()
+            try:
+                await cursor.execute(sql, params or [])
+                rows = await cursor.fetchall()
+            except oracledb.DatabaseError as e:
+                error, = e.args
+                record["error"] = error.full_code
+                raise
+            finally:
+                record["elapsed"] = time.perf_counter() - start
+            record["rows"] = len(rows)
+            df = pd.DataFrame.from_records(rows, columns=[d[0] for d in cursor.description])
+    finally:
+        metrics.record_query(record)
+        await conn.close()
+    
+    df.columns = columns or [name.lower() for name in df.columns]
+    return df
 
+async def get_customer_reservations_async(customer_id):
+    try:
+        return await fetch_dataframe_async(CUSTOMER_RESERVATIONS_SQL, [customer_id], CUSTOMER_RESERVATIONS_COLUMNS)
+    except oracledb.DatabaseError as e:
+        print(f"Error in get_customer_reservations_async: {e}")
+        return pd.DataFrame(columns=CUSTOMER_RESERVATIONS_COLUMNS)
+
+async def get_customer_payments_async(customer_id):
+    try:
+        return await fetch_dataframe_async(CUSTOMER_PAYMENTS_SQL, [customer_id], CUSTOMER_PAYMENTS_COLUMNS)
+    except oracledb.DatabaseError as e:
+        print(f"Error in get_customer_payments_async: {e}")
+        return pd.DataFrame(columns=CUSTOMER_PAYMENTS_COLUMNS)
+
+async def get_pending_payments_async(limit=None):
+    sql, params = pending_payments_query(limit)
+    try:
+        return await fetch_dataframe_async(sql, params, PENDING_PAYMENTS_COLUMNS)
+    except oracledb.DatabaseError as e:
+        print(f"Error in get_pending_payments_async: {e}")
+        return pd.DataFrame(columns=PENDING_PAYMENTS_COLUMNS)
+
+async def get_all_reservations_async():
+    try:
+        return await fetch_dataframe_async(ALL_RESERVATIONS_SQL, None, ALL_RESERVATIONS_COLUMNS)
+    except oracledb.DatabaseError as e:
+        print(f"Error in get_all_reservations_async: {e}")
+        return pd.DataFrame(columns=ALL_RESERVATIONS_COLUMNS)
+
+async def get_available_cars_async():
+    # Cars with no active booking right now; shares the sync snapshot and cache
+    snapshot = get_fresh_availability_snapshot()
+    if snapshot:
+        return snapshot.available_now()
+    try:
+        return await get_catalog_cache().get_async(
+            ("available_cars",),
+            lambda: fetch_dataframe_async(AVAILABLE_CARS_SQL, None, AVAILABLE_CARS_COLUMNS)
+        )
+    except oracledb.DatabaseError as e:
+        print(f"Error in get_available_cars_async: {e}")
+        return pd.DataFrame(columns=AVAILABLE_CARS_COLUMNS)
+
+async def get_all_cars_async():
+    try:
+        return await get_catalog_cache().get_async(
+            ("all_cars",),
+            lambda: fetch_dataframe_async(ALL_CARS_SQL, None, ALL_CARS_COLUMNS)
+        )
+    except oracledb.DatabaseError as e:
+        print(f"Error in get_all_cars_async: {e}")
+        return pd.DataFrame(columns=ALL_CARS_COLUMNS)
 
+# Page prefetch: a page starts all its independent reads before rendering.
+# Sync readers run on a shared thread pool, coroutines on the async loop.
+DB_PREFETCH_WORKERS = int(os.getenv("DB_PREFETCH_WORKERS", "4"))
+DB_PREFETCH_TIMEOUT = float(os.getenv("DB_PREFETCH_TIMEOUT", "10"))
 
+# Shared by all sessions; capped below the pool size so prefetching alone
+# cannot take every connection
+@st.cache_resource
+def get_prefetch_executor():
+    workers = max(1, min(DB_PREFETCH_WORKERS, DB_POOL_MAX - 1))
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="db-prefetch")
+
+# Returned by PrefetchedQuery.result() for a read that did not arrive in time
+PREFETCH_TIMED_OUT = object()
+
+class PrefetchedQuery:
+    def __init__(self, name, future, timeout, page):
+        self.name = name
+        self.future = future
+        self.deadline = time.perf_counter() + timeout
+        self.page = page
+    
+    def result(self):
+        # The deadline includes time queued for a worker. cancel() only drops
+        # a read still in the queue; one already running is bounded by the
+        # call timeout prefetch() puts on its connection.
+        try:
+            return self.future.result(max(0, self.deadline - time.perf_counter()))
+        except TimeoutError:
+            self.future.cancel()
+            get_query_metrics().record_prefetch_timeout(self.page, self.name)
+            return PREFETCH_TIMED_OUT
+
+def prefetch(queries, timeout=DB_PREFETCH_TIMEOUT):
+    # queries maps a name to a coroutine or a plain callable; returns a
+    # PrefetchedQuery per name. Each read runs in a copy of the caller's
+    # context, so it is counted against the current page.
+    executor = get_prefetch_executor()
+    stats = rerun_stats.get()
+    page = stats["page"] if stats else None
+    prefetched = {}
+    token = call_timeout.set(max(1, int(timeout * 1000)))
+    try:
+        for name, query in queries.items():
+            if asyncio.iscoroutine(query):
+                future = submit_async(query)
+            else:
+                future = executor.submit(contextvars.copy_context().run, query)
+            prefetched[name] = PrefetchedQuery(name, future, timeout, page)
+    finally:
+        call_timeout.reset(token)
+    return prefetched
+
+def prefetch_customer_dashboard(customer_id):
+    if DB_ASYNC:
+        return prefetch({
+            "reservations": get_customer_reservations_async(customer_id),
+            "payments": get_customer_payments_async(customer_id),
+            "cars": get_available_cars_async()
+        })
+    return prefetch({
+        "reservations": lambda: get_customer_reservations(customer_id),
+        "payments": lambda: get_customer_payments(customer_id),
+        "cars": get_available_cars
+    })
+
+def prefetch_employee_dashboard():
+    return prefetch({
+        "stats": get_dashboard_stats,
+        "recent": lambda: get_reservations_page(limit=5)[0],
+        "payments": get_pending_payments_async(limit=5) if DB_ASYNC else lambda: get_pending_payments(limit=5)
+    })
 
 def main():
-    # Initialize the database
+    # Initialize the database and start this worker's cache invalidation
+    # listener (cached: only the first run per process does work)
     try:
         init_db()
+        get_invalidation_bus()
     except Exception as e:
         st.error(f"Database initialization failed: {e}")
     
@@ -811,8 +1351,18 @@ def main():
         st.session_state.user_type = None
         st.session_state.customer_id = None
         st.session_state.employee_id = None
+        st.session_state.username = None
+        st.session_state.profile = None
         st.session_state.current_page = "login"
     
+    if "session_stats" not in st.session_state:
+        st.session_state.session_stats = {"db_calls": 0, "acquires": 0}
+    stats = {"page": st.session_state.current_page, "db_calls": 0, "acquires": 0,
+             "session": st.session_state.session_stats}
+    rerun_stats.set(stats)
+    st.session_state.last_rerun_stats = stats
+    get_query_metrics().record_rerun(stats["page"])
+    
     # Sidebar for navigation when logged in
     if st.session_state.logged_in:
         with st.sidebar:
@@ -820,7 +1370,7 @@ def main():
             st.write(f"Welcome, {st.session_state.user_type}!")
             
             if st.session_state.user_type == "Customer":
-                customer_info = get_customer_info(st.session_state.customer_id)
+                customer_info = get_session_profile()
                 if customer_info:
                     st.write(f"Name: {customer_info['name']}")
                 
@@ -831,7 +1381,7 @@ def main():
                 st.button("Profile", on_click=lambda: set_page("customer_profile"))
             
             elif st.session_state.user_type == "Employee":
-                employee_info = get_employee_info(st.session_state.employee_id)
+                employee_info = get_session_profile()
                 if employee_info:
                     st.write(f"Name: {employee_info['name']}")
                 
@@ -840,6 +1390,8 @@ def main():
                 st.button("Process Payments", on_click=lambda: set_page("process_payments"))
                 st.button("Manage Reservations", on_click=lambda: set_page("manage_reservations"))
                 st.button("Profile", on_click=lambda: set_page("employee_profile"))
+                if is_admin():
+                    st.button("System Performance", on_click=lambda: set_page("system_performance"))
             
             if st.button("Logout"):
                 logout()
@@ -873,18 +1425,40 @@ def main():
             render_manage_reservations()
         elif st.session_state.current_page == "employee_profile":
             render_employee_profile()
+        elif st.session_state.current_page == "system_performance":
+            render_system_performance()
         elif st.session_state.current_page == "register":
             render_register_page()
 
 def set_page(page):
     st.session_state.current_page = page
 
+ADMIN_USERNAME = os.getenv("ADMIN_USERNAME", "admin")
+
+def is_admin():
+    return st.session_state.get("user_type") == "Employee" and st.session_state.get("username") == ADMIN_USERNAME
+
+# The logged-in user's profile lives in session state; it is filled at login
+# and only re-fetched after invalidate_session_profile()
+def get_session_profile():
+    if st.session_state.get("profile") is None:
+        if st.session_state.user_type == "Customer":
+            st.session_state.profile = get_customer_info(st.session_state.customer_id)
+        elif st.session_state.user_type == "Employee":
+            st.session_state.profile = get_employee_info(st.session_state.employee_id)
+    return st.session_state.profile
+
+def invalidate_session_profile():
+    st.session_state.profile = None
+
 def logout():
     st.session_state.logged_in = False
     st.session_state.user_id = None
     st.session_state.user_type = None
     st.session_state.customer_id = None
     st.session_state.employee_id = None
+    st.session_state.username = None
+    invalidate_session_profile()
     st.session_state.current_page = "login"
     st.rerun()
 
@@ -920,9 +1494,15 @@ def render_register_page():
                 elif password != conf_password:
                     st.error("Passwords do not match")
                 else:
-                    user_id = register_user(username, password, user_type)
+                    try:
+                        user_id = register_user(username, password, user_type)
+                        busy = False
+                    except LoginRateLimited:
+                        user_id, busy = None, True
                     
-                    if user_id:
+                    if busy:
+                        st.error("The server is busy. Please try again in a moment.")
+                    elif user_id:
                         if user_type == "Customer":
                             customer_id = register_customer(user_id, name, email, phone, address, street, city, id_number, license_number)
                             if customer_id:
@@ -963,23 +1543,30 @@ def render_login_page():
             
             if st.button("Login", key="login_button"):
                 if username and password:
-                    user_info = authenticate(username, password)
-                    if user_info:
+                    try:
+                        user_info = login(username, password, st.context.ip_address)
+                        rate_limited = False
+                    except LoginRateLimited:
+                        user_info, rate_limited = None, True
+                    
+                    if rate_limited:
+                        st.error("Too many login attempts. Please wait a minute and try again.")
+                    elif user_info:
                         st.session_state.logged_in = True
                         st.session_state.user_id = user_info["user_id"]
                         st.session_state.user_type = user_info["user_type"]
+                        st.session_state.username = username
+                        st.session_state.profile = user_info["profile"]
                         
                         if user_info["user_type"] == "Customer":
-                            customer_id = get_customer_id_by_user_id(user_info["user_id"])
-                            if customer_id:
-                                st.session_state.customer_id = customer_id
+                            if user_info["customer_id"]:
+                                st.session_state.customer_id = user_info["customer_id"]
                                 st.rerun()
                             else:
                                 st.error("Customer record not found. Please contact support.")
                         elif user_info["user_type"] == "Employee":
-                            employee_id = get_employee_id_by_user_id(user_info["user_id"])
-                            if employee_id:
-                                st.session_state.employee_id = employee_id
+                            if user_info["employee_id"]:
+                                st.session_state.employee_id = user_info["employee_id"]
                                 st.rerun()
                             else:
                                 st.error("Employee record not found. Please contact support.")
@@ -1013,9 +1600,15 @@ def render_login_page():
                 elif password != conf_password:
                     st.error("Passwords do not match")
                 else:
-                    user_id = register_user(username, password, user_type)
+                    try:
+                        user_id = register_user(username, password, user_type)
+                        busy = False
+                    except LoginRateLimited:
+                        user_id, busy = None, True
                     
-                    if user_id:
+                    if busy:
+                        st.error("The server is busy. Please try again in a moment.")
+                    elif user_id:
                         if user_type == "Customer":
                             customer_id = register_customer(user_id, name, email, phone, address, street, city, id_number, license_number)
                             if customer_id:
@@ -1038,31 +1631,36 @@ def render_login_page():
 def render_customer_dashboard():
     st.title("Customer Dashboard")
     
+    queries = prefetch_customer_dashboard(st.session_state.customer_id)
+    
     col1, col2 = st.columns(2)
     
     with col1:
         st.subheader("Quick Stats")
         
-        # Get customer reservations
-        reservations = get_customer_reservations(st.session_state.customer_id)
-        active_reservations = [r for r in reservations if r["status"] == "Active"]
-        pending_reservations = [r for r in reservations if r["status"] == "Pending"]
-        
-        # Get customer payments
-        payments = get_customer_payments(st.session_state.customer_id)
-        pending_payments = [p for p in payments if p["pay_status"] == "Pending"]
-        
-        # Display quick stats
-        st.metric("Active Reservations", len(active_reservations))
-        st.metric("Pending Reservations", len(pending_reservations))
-        st.metric("Pending Payments", len(pending_payments))
+        # Reservation and payment counters
+        reservations = queries["reservations"].result()
+        payments = queries["payments"].result()
+        if reservations is PREFETCH_TIMED_OUT or payments is PREFETCH_TIMED_OUT:
+            st.warning("Your reservations and payments could not be loaded right now. Please try again.")
+        else:
+            active_reservations = int((reservations["status"] == "Active").sum())
+            pending_reservations = int((reservations["status"] == "Pending").sum())
+            pending_payments = int((payments["pay_status"] == "Pending").sum())
+            
+            # Display quick stats
+            st.metric("Active Reservations", active_reservations)
+            st.metric("Pending Reservations", pending_reservations)
+            st.metric("Pending Payments", pending_payments)
     
     with col2:
-        st.subheader("Available Cars")
-        cars = get_available_cars()
+        st.subheader("Available Now")
+        cars_df = queries["cars"].result()
         
-        if cars:
-            cars_df = pd.DataFrame(cars)
+        if cars_df is PREFETCH_TIMED_OUT:
+            st.warning("Available cars could not be loaded right now. Please try again.")
+        elif not cars_df.empty:
+            st.caption("Cars not out on a rental today. Make a Reservation shows what is free for your dates.")
             st.dataframe(cars_df[["model", "plate_no", "daily_price"]], hide_index=True)
             
             if st.button("Make a Reservation"):
@@ -1073,67 +1671,73 @@ def render_customer_dashboard():
 def render_make_reservation():
     st.title("Make a Reservation")
     
-    # Get available cars
-    cars = get_available_cars()
+    # Date selection for pickup and return
+    min_date = datetime.date.today() + timedelta(days=1)
+    pickup_date = st.date_input("Select pickup date", min_value=min_date, value=min_date)
+    return_date = st.date_input("Select return date", min_value=pickup_date, value=pickup_date)
     
-    if not cars:
-        st.info("No cars available at the moment")
+    if return_date < pickup_date:
+        st.warning("Return date cannot be before the pickup date")
         return
     
-    # Create a dataframe for display
-    cars_df = pd.DataFrame(cars)
+    pickup_str = pickup_date.strftime("%Y-%m-%d")
+    return_str = return_date.strftime("%Y-%m-%d")
+    
+    # Get cars that are free for the whole period
+    cars_df = get_available_cars(pickup_str, return_str)
+    
+    if cars_df.empty:
+        st.info("No cars available for the selected dates")
+        return
     
     # Display cars for selection
     st.subheader("Available Cars")
     st.dataframe(cars_df[["model", "plate_no", "daily_price"]], hide_index=True)
     
     # Car selection
-    car_options = {f"{car['model']} ({car['plate_no']}) - ${car['daily_price']}/day": car["car_id"] for car in cars}
+    car_options = {f"{car['model']} ({car['plate_no']}) - ${car['daily_price']}/day": car["car_id"] for car in cars_df.to_dict("records")}
     selected_car = st.selectbox("Select a car", list(car_options.keys()))
     
-    # Date selection for pickup
-    min_date = datetime.date.today() + timedelta(days=1)
-    pickup_date = st.date_input("Select pickup date", min_value=min_date, value=min_date)
-    
     # Submit reservation
     if st.button("Submit Reservation"):
         if selected_car and pickup_date:
             car_id = car_options[selected_car]
-            pickup_str = pickup_date.strftime("%Y-%m-%d")
             
-            reservation_id = make_reservation(st.session_state.customer_id, car_id, pickup_str)
-            
-            if reservation_id:
+            try:
+                reservation_id, pay_id = book_car(st.session_state.customer_id, car_id, pickup_str, return_str)
+            except oracledb.DatabaseError as e:
+                error, = e.args
+                if error.code == BOOKING_CONFLICT_CODE:
+                    st.error("This car was just booked for these dates. Please choose another car.")
+                else:
+                    print(f"Error in book_car: {e}")
+                    st.error("Failed to make reservation. Please try again.")
+            else:
                 st.success(f"Reservation successful! Your reservation ID is {reservation_id}")
                 st.info("Please make the payment before the pickup date to confirm your reservation")
                 
                 if st.button("View My Reservations"):
                     set_page("customer_reservations")
-            else:
-                st.error("Failed to make reservation. Please try again.")
 
 def render_customer_reservations():
     st.title("My Reservations")
     
     # Get customer reservations
-    reservations = get_customer_reservations(st.session_state.customer_id)
+    reservations_df = get_customer_reservations(st.session_state.customer_id)
     
-    if not reservations:
+    if reservations_df.empty:
         st.info("You have no reservations yet")
         return
     
-    # Create dataframe for display
-    reservations_df = pd.DataFrame(reservations)
-    
     # Display reservations with columns we know exist
     display_columns = ["resv_id", "model", "plate_no", "daily_price", 
-                      "pickup_day", "reserve_date", "status"]
+                      "pickup_day", "return_day", "reserve_date", "status"]
     st.dataframe(reservations_df[display_columns], hide_index=True)
     
     # Allow cancellation of pending reservations
     st.subheader("Cancel Reservation")
     
-    pending_reservations = [r for r in reservations if r["status"] == "Pending"]
+    pending_reservations = reservations_df[reservations_df["status"] == "Pending"].to_dict("records")
     
     if pending_reservations:
         cancel_options = {f"ID {r['resv_id']} - {r['model']} ({r['pickup_day']})": r["resv_id"] for r in pending_reservations}
@@ -1155,15 +1759,12 @@ def render_customer_payments():
     st.title("My Payments")
     
     # Get customer payments
-    payments = get_customer_payments(st.session_state.customer_id)
+    payments_df = get_customer_payments(st.session_state.customer_id)
     
-    if not payments:
+    if payments_df.empty:
         st.info("You have no payment records yet")
         return
     
-    # Create dataframe for display
-    payments_df = pd.DataFrame(payments)
-    
     # Display payments
     st.dataframe(
         payments_df[["pay_id", "amount", "pay_date", "due_date", "method", "pay_status", "employee_name"]],
@@ -1171,16 +1772,16 @@ def render_customer_payments():
     )
     
     # Highlight pending payments
-    pending_payments = [p for p in payments if p["pay_status"] == "Pending"]
+    pending_payments = int((payments_df["pay_status"] == "Pending").sum())
     
     if pending_payments:
-        st.warning(f"You have {len(pending_payments)} pending payment(s). Please visit our office to complete your payments.")
+        st.warning(f"You have {pending_payments} pending payment(s). Please visit our office to complete your payments.")
 
 def render_customer_profile():
     st.title("My Profile")
     
     # Get customer info
-    customer_info = get_customer_info(st.session_state.customer_id)
+    customer_info = get_session_profile()
     
     if not customer_info:
         st.error("Could not retrieve profile information")
@@ -1209,56 +1810,154 @@ def render_customer_profile():
 def render_employee_dashboard():
     st.title("Employee Dashboard")
     
+    queries = prefetch_employee_dashboard()
+    
     col1, col2 = st.columns(2)
     
     with col1:
         st.subheader("Quick Stats")
         
-        # Get all reservations
-        reservations = get_all_reservations()
-        active_reservations = [r for r in reservations if r["status"] == "Active"]
-        pending_reservations = [r for r in reservations if r["status"] == "Pending"]
-        
-        # Get pending payments
-        pending_payments = get_pending_payments()
+        # All counters come from one aggregate query
+        stats = queries["stats"].result()
         
-        # Get car count
-        cars = get_all_cars()
-        available_cars = get_available_cars()
-        
-        # Display quick stats
-        st.metric("Active Reservations", len(active_reservations))
-        st.metric("Pending Reservations", len(pending_reservations))
-        st.metric("Pending Payments", len(pending_payments))
-        st.metric("Available Cars", len(available_cars), f"{len(available_cars)}/{len(cars)}")
+        if stats is PREFETCH_TIMED_OUT:
+            st.warning("Dashboard counters could not be loaded right now. Please try again.")
+        else:
+            # Display quick stats
+            st.metric("Active Reservations", stats["active_reservations"])
+            st.metric("Pending Reservations", stats["pending_reservations"])
+            st.metric("Pending Payments", stats["pending_payments"])
+            st.metric("Available Cars", stats["available_cars"], f"{stats['available_cars']}/{stats['total_cars']}")
     
     with col2:
         st.subheader("Recent Reservations")
+        recent_df = queries["recent"].result()
         
-        if reservations:
-            recent_df = pd.DataFrame(reservations[:5])
+        if recent_df is PREFETCH_TIMED_OUT:
+            st.warning("Recent reservations could not be loaded right now. Please try again.")
+        elif not recent_df.empty:
             st.dataframe(recent_df[["customer_name", "model", "pickup_day", "status"]], hide_index=True)
         else:
             st.info("No reservations found")
         
         st.subheader("Pending Payments")
+        payments_df = queries["payments"].result()
         
-        if pending_payments:
-            payments_df = pd.DataFrame(pending_payments[:5])
+        if payments_df is PREFETCH_TIMED_OUT:
+            st.warning("Pending payments could not be loaded right now. Please try again.")
+        elif not payments_df.empty:
             st.dataframe(payments_df[["customer_name", "amount", "due_date"]], hide_index=True)
         else:
             st.info("No pending payments")
 
+def render_system_performance():
+    st.title("System Performance")
+    
+    if not is_admin():
+        st.error("This page is only available to the administrator")
+        return
+    
+    metrics = get_query_metrics()
+    
+    st.subheader("Connection Pool")
+    pool = get_pool_stats()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Open", pool["opened"])
+    col2.metric("Busy", pool["busy"])
+    col3.metric("Max", pool["max"])
+    col4.metric("Utilization", f"{pool['busy'] / pool['max']:.0%}")
+    
+    st.subheader("Catalog Cache")
+    cache = get_cache_stats()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Hit Ratio", f"{cache['hit_ratio']:.1%}")
+    col2.metric("Hits", cache["hits"])
+    col3.metric("Misses", cache["misses"])
+    col4.metric("Entries", cache["entries"])
+    
+    st.subheader("Slowest Queries")
+    top_n = st.number_input("Show top", min_value=5, max_value=100, value=10, step=5)
+    queries_df = pd.DataFrame(metrics.query_summary())
+    if not queries_df.empty:
+        st.dataframe(queries_df.sort_values("mean_ms", ascending=False).head(top_n), hide_index=True)
+    else:
+        st.info("No queries recorded yet")
+    
+    st.subheader(f"Recent Queries Over {SLOW_QUERY_MS:.0f} ms")
+    slow_df = pd.DataFrame(metrics.slow_queries())
+    if not slow_df.empty:
+        slow_df["at"] = pd.to_datetime(slow_df["at"], unit="s")
+        slow_df["elapsed_ms"] = slow_df["elapsed"] * 1000
+        st.dataframe(slow_df[["at", "page", "query_id", "elapsed_ms", "rows", "error", "fingerprint"]].iloc[::-1], hide_index=True)
+    else:
+        st.info("No slow queries")
+    
+    st.subheader("Prefetch Timeouts")
+    timeouts_df = pd.DataFrame(metrics.prefetch_timeout_summary())
+    if not timeouts_df.empty:
+        st.dataframe(timeouts_df.sort_values("timeouts", ascending=False), hide_index=True)
+    else:
+        st.info("No prefetched reads have timed out")
+    
+    st.subheader("DB Round Trips per Rerun")
+    pages_df = pd.DataFrame(metrics.page_summary())
+    if not pages_df.empty:
+        st.dataframe(pages_df.sort_values("per_rerun", ascending=False), hide_index=True)
+    
+    st.subheader("Background Queries")
+    background_df = pd.DataFrame(metrics.background_summary())
+    if not background_df.empty:
+        st.dataframe(background_df.sort_values("calls", ascending=False), hide_index=True)
+    else:
+        st.info("No background queries recorded yet")
+    
+    st.subheader("Table Sizes")
+    counts, first_sample = get_table_row_counts()
+    if counts:
+        first_sampled, first_counts = first_sample
+        hours = (time.time() - first_sampled) / 3600
+        st.dataframe(pd.DataFrame({
+            "table": list(counts),
+            "rows": list(counts.values()),
+            "change": [counts[table] - first_counts[table] for table in counts],
+            "rows_per_hour": [(counts[table] - first_counts[table]) / hours if hours else 0.0 for table in counts]
+        }), hide_index=True)
+        st.caption(f"Change since {datetime.datetime.fromtimestamp(first_sampled):%Y-%m-%d %H:%M:%S}")
+    
+    st.subheader("Index Usage")
+    # EXPLAIN on every hot query shape; only run on request
+    if st.button("Check index usage"):
+        checks_df = pd.DataFrame(check_index_usage())
+        if checks_df.empty:
+            st.error("Could not read the query plans")
+        else:
+            unused = checks_df[~checks_df["used"]]
+            if unused.empty:
+                st.success("Every hot query uses its index")
+            else:
+                st.warning(f"Not using their index: {', '.join(unused['query'])}")
+            st.dataframe(checks_df[["query", "index", "used"]], hide_index=True)
+            with st.expander("Plans"):
+                for check in checks_df.to_dict("records"):
+                    st.text(f"{check['query']}\n{check['plan']}")
+    
+    st.download_button("Download Prometheus metrics", export_prometheus_metrics(),
+                       file_name="car_rental_metrics.prom", mime="text/plain")
+
 def render_manage_cars():
     st.title("Manage Cars")
     
-    tab1, tab2 = st.tabs(["View Cars", "Add New Car"])
+    tab1, tab2, tab3 = st.tabs(["View Cars", "Add New Car", "Bulk Import"])
     
     with tab1:
-        cars = get_all_cars()
+        cars_df = get_all_cars()
+        
+        # Booking load per car, when the availability snapshot is up to date
+        snapshot = get_fresh_availability_snapshot()
+        if snapshot and not cars_df.empty:
+            cars_df = cars_df.merge(snapshot.car_status(), on="car_id", how="left")
         
-        if cars:
-            cars_df = pd.DataFrame(cars)
+        if not cars_df.empty:
             st.dataframe(cars_df, hide_index=True)
         else:
             st.info("No cars found in the database")
@@ -1281,69 +1980,104 @@ def render_manage_cars():
                     st.error("Failed to add car. The license plate might already be in use.")
             else:
                 st.warning("Please fill in all fields")
+    
+    with tab3:
+        st.subheader("Bulk Import")
+        st.write("Upload a CSV or Parquet file with columns: model, plate_no, daily_price")
+        
+        uploaded_file = st.file_uploader("Car file", type=["csv", "parquet"])
+        
+        if uploaded_file and st.button("Import Cars"):
+            file_format = "parquet" if uploaded_file.name.lower().endswith(".parquet") else "csv"
+            try:
+                report = import_cars(uploaded_file, file_format)
+            except (ValueError, oracledb.DatabaseError) as e:
+                st.error(f"Import failed: {e}")
+            else:
+                st.success(f"Imported {report['inserted']} cars in {report['elapsed']:.2f}s ({report['rows_per_second']:.0f} rows/s)")
+                if report["failed"]:
+                    st.warning(f"{len(report['failed'])} rows were rejected")
+                    st.dataframe(pd.DataFrame(report["failed"]), hide_index=True)
 
 def render_process_payments():
     st.title("Process Payments")
     
     # Get pending payments
-    pending_payments = get_pending_payments()
+    payments_df = get_pending_payments()
     
-    if not pending_payments:
+    if payments_df.empty:
         st.info("No pending payments to process")
         return
     
     # Display pending payments
     st.subheader("Pending Payments")
-    payments_df = pd.DataFrame(pending_payments)
     st.dataframe(payments_df, hide_index=True)
     
     # Payment processing form
-    st.subheader("Process Payment")
-    
-    payment_options = {f"ID {p['pay_id']} - {p['customer_name']} (${p['amount']})": p["pay_id"] for p in pending_payments}
-    selected_payment = st.selectbox("Select payment to process", list(payment_options.keys()))
+    st.subheader("Process Payments")
+    
+    payment_options = {f"ID {p['pay_id']} - {p['customer_name']} (${p['amount']})": p["pay_id"] for p in payments_df.to_dict("records")}
+    select_all = st.checkbox(f"Select all {len(payment_options)} pending payments")
+    selected_payments = st.multiselect(
+        "Select payments to process",
+        list(payment_options.keys()),
+        default=list(payment_options.keys()) if select_all else []
+    )
     
     payment_method = st.selectbox("Payment Method", ["Cash", "Credit Card", "Debit Card", "Bank Transfer"])
     
-    if st.button("Process Payment"):
-        pay_id = payment_options[selected_payment]
-        success = process_payment(pay_id, payment_method, st.session_state.employee_id)
+    if st.button("Process Payments", disabled=not selected_payments):
+        pay_ids = [payment_options[label] for label in selected_payments]
+        settled = process_payments(pay_ids, payment_method, st.session_state.employee_id)
         
-        if success:
-            st.success("Payment processed successfully")
+        if settled:
+            st.success(f"Processed {settled} of {len(pay_ids)} payments")
             st.rerun()
         else:
-            st.error("Failed to process payment")
+            st.error("Failed to process payments")
 
 def render_manage_reservations():
     st.title("Manage Reservations")
     
-    # Get all reservations
-    reservations = get_all_reservations()
-    
-    if not reservations:
-        st.info("No reservations found")
-        return
-    
     # Filter options
     status_filter = st.selectbox("Filter by Status", ["All", "Pending", "Active", "Completed", "Cancelled"])
     
-    # Apply filters
-    filtered_reservations = reservations
-    if status_filter != "All":
-        filtered_reservations = [r for r in reservations if r["status"] == status_filter]
+    # Page cursors seen so far for this filter; the last one selects the current page
+    if st.session_state.get("resv_filter") != status_filter:
+        st.session_state.resv_filter = status_filter
+        st.session_state.resv_cursors = [None]
+    
+    reservations_df, next_cursor = get_reservations_page(
+        status=None if status_filter == "All" else status_filter,
+        after=st.session_state.resv_cursors[-1]
+    )
     
     # Display reservations
-    if filtered_reservations:
-        reservations_df = pd.DataFrame(filtered_reservations)
+    if not reservations_df.empty:
         st.dataframe(reservations_df, hide_index=True)
+    elif status_filter == "All":
+        st.info("No reservations found")
+        return
     else:
         st.info(f"No reservations with status '{status_filter}'")
     
+    # Page navigation
+    col1, col2, col3 = st.columns([1, 1, 4])
+    with col1:
+        if st.button("Previous", disabled=len(st.session_state.resv_cursors) == 1):
+            st.session_state.resv_cursors.pop()
+            st.rerun()
+    with col2:
+        if st.button("Next", disabled=next_cursor is None):
+            st.session_state.resv_cursors.append(next_cursor)
+            st.rerun()
+    with col3:
+        st.write(f"Page {len(st.session_state.resv_cursors)}")
+    
     # Reservation management form
     st.subheader("Update Reservation Status")
     
-    updatable_reservations = [r for r in reservations if r["status"] in ["Pending", "Active"]]
+    updatable_reservations = reservations_df[reservations_df["status"].isin(["Pending", "Active"])].to_dict("records")
     
     if updatable_reservations:
         reservation_options = {f"ID {r['resv_id']} - {r['customer_name']} ({r['model']})": r["resv_id"] for r in updatable_reservations}
@@ -1377,7 +2111,7 @@ def render_employee_profile():
     st.title("Employee Profile")
     
     # Get employee info
-    employee_info = get_employee_info(st.session_state.employee_id)
+    employee_info = get_session_profile()
     
     if not employee_info:
         st.error("Could not retrieve profile information")
@@ -0,0 +1,239 @@
+import streamlit as st
+import oracledb
+import hashlib
+import hmac
+import secrets
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from db import get_connection
+
+# Stored as pbkdf2_sha256$<iterations>$<salt>$<hash>; legacy SHA-256 rows and
+# other iteration counts are rehashed on the next successful login
+PASSWORD_KDF_ITERATIONS = int(os.getenv("PASSWORD_KDF_ITERATIONS", "200000"))
+# Beyond AUTH_KDF_MAX_PENDING queued hashes, logins are turned away
+AUTH_KDF_WORKERS = int(os.getenv("AUTH_KDF_WORKERS", "4"))
+AUTH_KDF_MAX_PENDING = int(os.getenv("AUTH_KDF_MAX_PENDING", "32"))
+AUTH_KDF_TIMEOUT = float(os.getenv("AUTH_KDF_TIMEOUT", "10"))
+# Token buckets per client IP and per username/IP
+AUTH_RATE_BURST = float(os.getenv("AUTH_RATE_BURST", "5"))
+AUTH_RATE_REFILL = float(os.getenv("AUTH_RATE_REFILL", "0.2"))
+# Seconds a username that does not exist is answered without the database
+AUTH_UNKNOWN_USER_TTL = float(os.getenv("AUTH_UNKNOWN_USER_TTL", "60"))
+
+class LoginRateLimited(Exception):
+    pass
+
+def hash_password(password, salt=None, iterations=None):
+    salt = salt or os.urandom(16)
+    iterations = iterations or PASSWORD_KDF_ITERATIONS
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+    return f"pbkdf2_sha256${iterations}${salt.hex()}${digest.hex()}"
+
+def verify_password(password, stored):
+    # Returns (matches, needs_rehash)
+    if stored.startswith("pbkdf2_sha256$"):
+        _, iterations, salt, digest = stored.split("$")
+        candidate = hashlib.pbkdf2_hmac("sha256", password.encode(), bytes.fromhex(salt), int(iterations))
+        return hmac.compare_digest(candidate.hex(), digest), int(iterations) != PASSWORD_KDF_ITERATIONS
+    # Legacy unsalted SHA-256
+    return hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), stored), True
+
+class KdfPool:
+    def __init__(self, workers, max_pending):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kdf")
+        self.slots = threading.BoundedSemaphore(max_pending)
+    
+    def run(self, fn, *args):
+        # pbkdf2_hmac releases the GIL, so the waiting script thread costs nothing
+        if not self.slots.acquire(blocking=False):
+            raise LoginRateLimited("Too many logins in progress")
+        future = self.executor.submit(fn, *args)
+        future.add_done_callback(lambda _: self.slots.release())
+        try:
+            return future.result(timeout=AUTH_KDF_TIMEOUT)
+        except TimeoutError:
+            raise LoginRateLimited("Password hashing timed out")
+
+class TokenBucketLimiter:
+    def __init__(self, burst, refill_rate, max_keys=10000):
+        self.burst = burst
+        self.refill_rate = refill_rate
+        self.max_keys = max_keys
+        self.buckets = {}  # key -> (tokens, updated_at)
+        self.lock = threading.Lock()
+    
+    def tokens(self, key, now):
+        tokens, updated = self.buckets.get(key, (self.burst, now))
+        return min(self.burst, tokens + (now - updated) * self.refill_rate)
+    
+    def available(self, key):
+        # Whether allow() would succeed, without spending a token
+        with self.lock:
+            return self.tokens(key, time.monotonic()) >= 1
+    
+    def allow(self, key):
+        now = time.monotonic()
+        with self.lock:
+            tokens = self.tokens(key, now)
+            allowed = tokens >= 1
+            self.buckets[key] = (tokens - 1 if allowed else tokens, now)
+            if len(self.buckets) > self.max_keys:
+                # Forget buckets that have refilled; they behave like new ones
+                self.buckets = {
+                    k: (t, u) for k, (t, u) in self.buckets.items()
+                    if t + (now - u) * self.refill_rate < self.burst
+                }
+            return allowed
+
+class ExpiringSet:
+    def __init__(self, ttl, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = {}  # item -> expires_at
+        self.lock = threading.Lock()
+    
+    def __contains__(self, item):
+        with self.lock:
+            expires = self.entries.get(item)
+            if expires is None:
+                return False
+            if expires < time.monotonic():
+                del self.entries[item]
+                return False
+            return True
+    
+    def add(self, item):
+        now = time.monotonic()
+        with self.lock:
+            if len(self.entries) >= self.max_entries:
+                self.entries = {k: e for k, e in self.entries.items() if e >= now}
+            if len(self.entries) < self.max_entries:
+                self.entries[item] = now + self.ttl
+    
+    def discard(self, item):
+        with self.lock:
+            self.entries.pop(item, None)
+
+# Shared by every session in the process
+@st.cache_resource
+def get_kdf_pool():
+    return KdfPool(AUTH_KDF_WORKERS, AUTH_KDF_MAX_PENDING)
+
+@st.cache_resource
+def get_login_limiter():
+    return TokenBucketLimiter(AUTH_RATE_BURST, AUTH_RATE_REFILL)
+
+@st.cache_resource
+def get_unknown_usernames():
+    return ExpiringSet(AUTH_UNKNOWN_USER_TTL)
+
+@st.cache_resource
+def get_dummy_password_hash():
+    # Verified against for unknown usernames so they cost as much as real ones
+    return hash_password(secrets.token_hex(16))
+
+# Returns None if the username is taken; raises LoginRateLimited when the
+# password hashing pool is saturated
+def register_user(username, password, user_type):
+    password_hash = get_kdf_pool().run(hash_password, password)
+    
+    try:
+        with get_connection() as conn:
+            with conn.cursor() as cursor:
+                user_id_var = cursor.var(oracledb.NUMBER)  # Create bind variable
+                cursor.execute(
+                    "INSERT INTO users (username, password, user_type) VALUES (:1, :2, :3) RETURNING user_id INTO :4",
+                    [username, password_hash, user_type, user_id_var]
+                )
+                user_id = user_id_var.getvalue()[0]  
+                conn.commit()
+                get_unknown_usernames().discard(username)
+                return user_id
+    except oracledb.IntegrityError:
+        return None
+
+def authenticate(username, password, client_ip=None):
+    user = login(username, password, client_ip)
+    if user:
+        return {"user_id": user["user_id"], "user_type": user["user_type"]}
+    return None
+
+# One round trip for login: the user row, its customer/employee id and profile.
+# Raises LoginRateLimited when the client IP is out of attempts, or this
+# username has had too many failed attempts from it.
+def login(username, password, client_ip=None):
+    limiter = get_login_limiter()
+    # Every attempt costs the IP a token. The username bucket is per IP and
+    # only charged on failure, so nobody else can lock a user out and
+    # successful logins are free.
+    failure_key = f"user:{username}:{client_ip}"
+    if (client_ip and not limiter.allow(f"ip:{client_ip}")) or not limiter.available(failure_key):
+        raise LoginRateLimited("Too many login attempts")
+    
+    kdf = get_kdf_pool()
+    unknown_usernames = get_unknown_usernames()
+    if username in unknown_usernames:
+        kdf.run(verify_password, password, get_dummy_password_hash())
+        limiter.allow(failure_key)
+        return None
+    
+    try:
+        with get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute('''
+                SELECT u.user_id, u.user_type, c.customer_id, e.emp_id,
+                       c.name, c.email, c.phone, c.address, c.street, c.city,
+                       c.id_number, c.license,
+                       e.name, e.email, e.phone, e.address, e.street, e.city,
+                       u.password
+                FROM users u
+                LEFT JOIN customer c ON c.user_id = u.user_id
+                LEFT JOIN employee e ON e.user_id = u.user_id
+                WHERE u.username = :1
+                ''', [username])
+                result = cursor.fetchone()
+                
+                if not result:
+                    unknown_usernames.add(username)
+                    kdf.run(verify_password, password, get_dummy_password_hash())
+                    limiter.allow(failure_key)
+                    return None
+                
+                matches, needs_rehash = kdf.run(verify_password, password, result[18])
+                if not matches:
+                    limiter.allow(failure_key)
+                    return None
+                
+                if needs_rehash:
+                    # Only replaces the hash that was just verified
+                    cursor.execute(
+                        "UPDATE users SET password = :1 WHERE user_id = :2 AND password = :3",
+                        [kdf.run(hash_password, password), result[0], result[18]]
+                    )
+                    conn.commit()
+                
+                if result[1] == "Customer" and result[2]:
+                    profile = dict(zip(
+                        ["name", "email", "phone", "address", "street", "city", "id_number", "license"],
+                        result[4:12]
+                    ))
+                elif result[1] == "Employee" and result[3]:
+                    profile = dict(zip(
+                        ["name", "email", "phone", "address", "street", "city"],
+                        result[12:18]
+                    ))
+                else:
+                    profile = None
+                
+                return {
+                    "user_id": result[0],
+                    "user_type": result[1],
+                    "customer_id": result[2],
+                    "employee_id": result[3],
+                    "profile": profile
+                }
+    except oracledb.DatabaseError as e:
+        print(f"Error in login: {e}")
+        return None
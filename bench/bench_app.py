@@ -0,0 +1,156 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+
+from bench.stats import summarize
+
+# Times the data-access functions in app.py at several reservation counts and
+# writes the latency percentiles as JSON, so two commits can be compared with
+# a plain diff of their result files.
+#
+#   python -m bench.bench_app --sizes 10000,100000,1000000 --output before.json
+#
+# Unless --warm is given, catalog caches are cleared before every sample and
+# the in-memory availability snapshot stays off, so the numbers show the
+# database work rather than cache hits. --warm turns the snapshot on, and
+# get_available_cars and get_available_cars_range are served from it once it
+# has loaded.
+
+BENCH_PASSWORD = "bench"
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def row_count(result):
+    # DataFrames count their rows; ids, dicts and True count as one row
+    if hasattr(result, "shape"):
+        return len(result)
+    return 1 if result else 0
+
+def build_cases(app, conn, rng, args):
+    import auth
+    from bench import seed
+
+    customer_ids = seed.fetch_ids(conn, "SELECT customer_id FROM customer")
+    car_ids = seed.fetch_ids(conn, "SELECT car_id FROM car")
+    employee_id = seed.fetch_ids(conn, "SELECT MIN(emp_id) FROM employee")[0]
+    pending_pay_ids = seed.fetch_ids(conn, "SELECT pay_id FROM payments WHERE pay_status = 'Pending'")
+    rng.shuffle(pending_pay_ids)
+    booked = []
+    today = datetime.date.today()
+
+    def book():
+        # Beyond the seeded year, so most bookings do not overlap
+        pickup = today + datetime.timedelta(days=rng.randint(400, 4000))
+        resv_id = app.make_reservation(rng.choice(customer_ids), rng.choice(car_ids),
+                                       pickup.isoformat(), (pickup + datetime.timedelta(days=1)).isoformat())
+        if resv_id:
+            booked.append(resv_id)
+        return resv_id
+
+    def range_start():
+        return today + datetime.timedelta(days=rng.randint(1, 365))
+
+    return {
+        "authenticate": lambda: auth.authenticate(f"bench_user_{rng.randrange(args.customers)}", BENCH_PASSWORD),
+        "get_available_cars": lambda: app.get_available_cars(),
+        "get_available_cars_range": lambda: (lambda start: app.get_available_cars(
+            start.isoformat(), (start + datetime.timedelta(days=3)).isoformat()))(range_start()),
+        "get_customer_reservations": lambda: app.get_customer_reservations(rng.choice(customer_ids)),
+        "get_all_reservations": lambda: app.get_all_reservations(),
+        "get_pending_payments": lambda: app.get_pending_payments(),
+        "make_reservation": book,
+        "process_payment": lambda: pending_pay_ids and app.process_payment(pending_pay_ids.pop(), "Cash", employee_id),
+        # Cancels the bench's own bookings so the seeded data stays as generated
+        "update_reservation_status": lambda: booked and app.update_reservation_status(booked.pop(), "Cancelled"),
+    }
+
+def run_case(app, fn, args):
+    latencies = []
+    rows = 0
+    deadline = time.perf_counter() + args.max_seconds
+    while len(latencies) < args.repeat and (len(latencies) < 3 or time.perf_counter() < deadline):
+        if not args.warm:
+            app.invalidate_catalog()
+        start = time.perf_counter()
+        result = fn()
+        latencies.append(time.perf_counter() - start)
+        rows += row_count(result)
+    return summarize(latencies, rows)
+
+def main():
+    parser = argparse.ArgumentParser(description="Data-access benchmark for app.py")
+    parser.add_argument("--cars", type=int, default=10000)
+    parser.add_argument("--customers", type=int, default=10000)
+    parser.add_argument("--sizes", default="10000,100000,1000000",
+                        help="comma-separated reservation counts to measure at")
+    parser.add_argument("--repeat", type=int, default=50, help="samples per function and size")
+    parser.add_argument("--max-seconds", type=float, default=10.0,
+                        help="stop sampling a function after this long (at least 3 samples)")
+    parser.add_argument("--functions", help="comma-separated subset of functions to time")
+    parser.add_argument("--warm", action="store_true", help="keep catalog caches and the availability snapshot between samples")
+    parser.add_argument("--db", default=os.path.join(tempfile.mkdtemp(), "bench_app.db"))
+    parser.add_argument("--output", default="bench_results.json")
+    args = parser.parse_args()
+
+    # Must be set before app reads its configuration
+    os.environ.setdefault("DB_BACKEND", "sqlite")
+    os.environ["DB_SQLITE_PATH"] = args.db
+    # authenticate is timed over and over for the same users; keep the rate limiter out of the way
+    os.environ.setdefault("AUTH_RATE_BURST", "1000000")
+    if args.warm:
+        os.environ.setdefault("AVAILABILITY_REFRESH_INTERVAL", "2")
+    else:
+        # invalidate_catalog() does not reach the snapshot, so keep it off altogether
+        os.environ["AVAILABILITY_REFRESH_INTERVAL"] = "0"
+
+    import app
+    import auth
+    from bench import seed
+
+    rng = random.Random(42)
+    results = []
+    app.init_db()
+    with app.get_connection() as conn:
+        seed.seed_cars(conn, args.cars)
+        seed.seed_customers(conn, args.customers, password_hash=auth.hash_password(BENCH_PASSWORD))
+
+        print(f"{'reservations':>12}  {'function':<26} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'rows/s':>11}")
+        seeded = 0
+        for size in [int(n) for n in args.sizes.split(",")]:
+            seed.seed_reservations(conn, size - seeded, rng=rng, with_payments=True)
+            seeded = size
+
+            cases = build_cases(app, conn, rng, args)
+            names = args.functions.split(",") if args.functions else list(cases)
+            for name in names:
+                stats = run_case(app, cases[name], args)
+                results.append({"reservations": size, "function": name, **stats})
+                print(f"{size:>12}  {name:<26} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} "
+                      f"{stats['p99_ms']:>9.2f} {stats['rows_per_second']:>11.0f}")
+
+    report = {
+        "commit": git_commit(),
+        "backend": app.DB_BACKEND,
+        "python": platform.python_version(),
+        "generated_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "config": {"cars": args.cars, "customers": args.customers, "repeat": args.repeat, "warm": args.warm,
+                   "availability_snapshot": app.AVAILABILITY_REFRESH_INTERVAL > 0},
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+# Compares the original correlated-COUNT availability query with the
+# anti-join in app.AVAILABLE_CARS_SQL as the reserve table grows.
+#
+#   python -m bench.bench_availability --cars 10000 --reservations 10000,100000,1000000
+
+LEGACY_AVAILABLE_CARS_SQL = '''
+SELECT 
+    car_id,
+    model,
+    plate_no,
+    daily_price,
+    (SELECT COUNT(*) 
+     FROM reserve r 
+     WHERE r.car_id = c.car_id 
+     AND r.status = 'Active') as active_bookings
+FROM car c
+WHERE (SELECT COUNT(*) 
+      FROM reserve r 
+      WHERE r.car_id = c.car_id 
+      AND r.status = 'Active') = 0
+ORDER BY daily_price
+'''
+
+def time_query(conn, sql, repeat):
+    timings = []
+    rows = 0
+    with conn.cursor() as cursor:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            cursor.execute(sql)
+            rows = len(cursor.fetchall())
+            timings.append(time.perf_counter() - start)
+    return statistics.median(timings), rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Availability query benchmark")
+    parser.add_argument("--cars", type=int, default=10000)
+    parser.add_argument("--customers", type=int, default=1000)
+    parser.add_argument("--reservations", default="10000,100000,1000000",
+                        help="comma-separated reservation counts to measure at")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--no-indexes", action="store_true", help="drop the reserve (car_id, status, ...) index first")
+    parser.add_argument("--db", default=os.path.join(tempfile.mkdtemp(), "bench_availability.db"))
+    args = parser.parse_args()
+
+    # Must be set before app reads its configuration
+    os.environ.setdefault("DB_BACKEND", "sqlite")
+    os.environ["DB_SQLITE_PATH"] = args.db
+
+    import app
+    from bench import seed
+
+    app.init_db()
+    with app.get_connection() as conn:
+        if args.no_indexes:
+            with conn.cursor() as cursor:
+                cursor.execute("DROP INDEX idx_reserve_car_status_dates")
+
+        seed.seed_cars(conn, args.cars)
+        seed.seed_customers(conn, args.customers)
+
+        print(f"{'reservations':>12}  {'correlated (s)':>14}  {'anti-join (s)':>13}  {'speedup':>7}  {'rows':>6}")
+        rng = random.Random(42)
+        seeded = 0
+        for target in [int(n) for n in args.reservations.split(",")]:
+            seed.seed_reservations(conn, target - seeded, rng=rng)
+            seeded = target
+
+            legacy_time, legacy_rows = time_query(conn, LEGACY_AVAILABLE_CARS_SQL, args.repeat)
+            new_time, new_rows = time_query(conn, app.AVAILABLE_CARS_SQL, args.repeat)
+            assert legacy_rows == new_rows, "queries disagree on available cars"
+
+            print(f"{target:>12}  {legacy_time:>14.4f}  {new_time:>13.4f}  {legacy_time / new_time:>6.1f}x  {new_rows:>6}")
+
+if __name__ == "__main__":
+    main()
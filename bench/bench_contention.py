@@ -0,0 +1,99 @@
+import argparse
+import datetime
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+from bench.stats import percentile
+
+# Hammers one car with concurrent bookings from several worker threads and
+# reports throughput, how often a booking lost to an overlapping one, and
+# latency percentiles (retries on lock timeouts are included in latency).
+#
+#   python -m bench.bench_contention --workers 16 --bookings 50
+
+def worker(app, customer_ids, car_id, bookings, days, seed, results, lock):
+    rng = random.Random(seed)
+    today = datetime.date.today()
+    outcomes = []
+    for _ in range(bookings):
+        pickup = today + datetime.timedelta(days=rng.randint(1, days))
+        return_day = pickup + datetime.timedelta(days=rng.randint(0, 2))
+        start = time.perf_counter()
+        try:
+            app.book_car(rng.choice(customer_ids), car_id, pickup.isoformat(), return_day.isoformat())
+            outcome = "booked"
+        except app.oracledb.DatabaseError as e:
+            error, = e.args
+            outcome = "conflict" if error.code == app.BOOKING_CONFLICT_CODE else f"error {error.code}"
+        outcomes.append((outcome, time.perf_counter() - start))
+    with lock:
+        results.extend(outcomes)
+
+def main():
+    parser = argparse.ArgumentParser(description="Booking contention benchmark")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--bookings", type=int, default=50, help="bookings attempted per worker")
+    parser.add_argument("--days", type=int, default=60, help="pickup days are drawn from the next N days")
+    parser.add_argument("--customers", type=int, default=100)
+    parser.add_argument("--db", default=os.path.join(tempfile.mkdtemp(), "bench_contention.db"))
+    args = parser.parse_args()
+
+    # Must be set before app reads its configuration
+    os.environ.setdefault("DB_BACKEND", "sqlite")
+    os.environ["DB_SQLITE_PATH"] = args.db
+    os.environ.setdefault("DB_POOL_MAX", str(args.workers))
+
+    import app
+    from bench import seed
+
+    app.init_db()
+    with app.get_connection() as conn:
+        seed.seed_customers(conn, args.customers)
+        customer_ids = seed.fetch_ids(conn, "SELECT customer_id FROM customer")
+        car_id = seed.fetch_ids(conn, "SELECT MIN(car_id) FROM car")[0]
+
+    results = []
+    lock = threading.Lock()
+    threads = [
+        threading.Thread(target=worker, args=(app, customer_ids, car_id, args.bookings, args.days, i, results, lock))
+        for i in range(args.workers)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = [latency for _, latency in results]
+    counts = {}
+    for outcome, _ in results:
+        counts[outcome] = counts.get(outcome, 0) + 1
+
+    with app.get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute('''
+                SELECT COUNT(*)
+                FROM reserve a
+                JOIN reserve b ON a.car_id = b.car_id AND a.resv_id < b.resv_id
+                WHERE a.status IN ('Pending', 'Active') AND b.status IN ('Pending', 'Active')
+                AND a.pickup_day <= b.return_day AND a.return_day >= b.pickup_day
+            ''')
+            overlaps, = cursor.fetchone()
+
+    print(f"workers={args.workers} attempts={len(results)} elapsed={elapsed:.2f}s")
+    print(f"throughput     {len(results) / elapsed:10.1f} attempts/s")
+    print(f"booked         {counts.get('booked', 0):10d}")
+    print(f"conflict rate  {counts.get('conflict', 0) / len(results):10.1%}")
+    for outcome in sorted(o for o in counts if o.startswith("error")):
+        print(f"{outcome:<14} {counts[outcome]:10d}")
+    print(f"p50 latency    {statistics.median(latencies) * 1000:10.2f} ms")
+    print(f"p99 latency    {percentile(latencies, 99) * 1000:10.2f} ms")
+    print(f"double-booked  {overlaps:10d}")
+
+if __name__ == "__main__":
+    main()
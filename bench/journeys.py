@@ -0,0 +1,85 @@
+import time
+
+# Scripted user journeys for bench.loadtest. They live in their own module
+# because spawned workers unpickle them by name, and AppTest replaces
+# __main__ while a script runs.
+#
+# Customers: login -> dashboard -> make reservation (submit) -> payments
+# Employees: login -> dashboard -> process payments -> manage reservations
+
+BENCH_PASSWORD = "bench"
+
+def warm_up():
+    # Process-pool initializer: pay for the imports and the migration check
+    # before any render is timed
+    from streamlit.testing.v1 import AppTest
+    import app
+    app.init_db()
+
+def app_script():
+    # Runs inside AppTest; importing app (rather than loading the file) keeps
+    # one module, pool and cache for every simulated session
+    import app
+    app.main()
+
+class Session:
+    def __init__(self, timeout):
+        from streamlit.testing.v1 import AppTest
+
+        self.at = AppTest.from_function(app_script, default_timeout=timeout)
+        self.samples = []
+        self.db_calls = 0
+
+    def record(self, step, label=None):
+        start = time.perf_counter()
+        step()
+        latency = time.perf_counter() - start
+        if self.at.exception:
+            raise RuntimeError(f"{label}: {self.at.exception[0].value}")
+        # The session total rather than last_rerun_stats, so a step whose
+        # handler calls st.rerun() counts the statements of every rerun
+        stats = self.at.session_state["last_rerun_stats"]
+        db_calls = self.at.session_state["session_stats"]["db_calls"]
+        self.samples.append((label or stats["page"], latency, db_calls - self.db_calls))
+        self.db_calls = db_calls
+
+    def open(self):
+        self.record(self.at.run, "login")
+
+    def login(self, username, password):
+        self.at.text_input(key="login_username").set_value(username)
+        self.at.text_input(key="login_password").set_value(password)
+        self.record(self.at.button(key="login_button").click().run, "login (submit)")
+
+    def navigate(self, label):
+        button = next(b for b in self.at.sidebar.button if b.label == label)
+        self.record(button.click().run)
+
+    def click(self, label, sample_label):
+        button = next(b for b in self.at.button if b.label == label)
+        self.record(button.click().run, sample_label)
+
+def customer_journey(index, timeout):
+    session = Session(timeout)
+    session.open()
+    session.login(f"bench_user_{index}", BENCH_PASSWORD)
+    session.navigate("Dashboard")
+    session.navigate("Make Reservation")
+    if session.at.selectbox:
+        session.click("Submit Reservation", "make_reservation (submit)")
+    session.navigate("My Payments")
+    return session.samples
+
+def employee_journey(index, timeout):
+    session = Session(timeout)
+    session.open()
+    session.login("admin", "admin123")
+    session.navigate("Dashboard")
+    session.navigate("Process Payments")
+    session.navigate("Manage Reservations")
+    return session.samples
+
+def run_journey(index, employee_every, customers, timeout):
+    if employee_every and index % employee_every == 0:
+        return "employee", employee_journey(index, timeout)
+    return "customer", customer_journey(index % customers, timeout)
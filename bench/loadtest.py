@@ -0,0 +1,103 @@
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from bench.journeys import BENCH_PASSWORD, run_journey, warm_up
+from bench.stats import summarize
+
+# Drives app.main() through Streamlit's AppTest for scripted user journeys
+# and reports render latency and DB calls for every page. A step that triggers
+# st.rerun() is timed and counted across all of its reruns.
+#
+#   python -m bench.loadtest --sessions 200 --concurrency 8
+#
+# AppTest swaps a process-wide Runtime in and out around every run, so two
+# sessions cannot render in the same process at once. Parallel sessions
+# therefore run in separate processes against the same database, each one
+# standing in for a Streamlit worker; renders/s per process is what a single
+# worker sustains at that level of database contention.
+#
+# The journeys themselves are in bench/journeys.py.
+
+def main():
+    parser = argparse.ArgumentParser(description="Streamlit page-render load test")
+    parser.add_argument("--sessions", type=int, default=50, help="journeys to run in total")
+    parser.add_argument("--concurrency", type=int, default=10, help="journeys in flight at once")
+    parser.add_argument("--employee-every", type=int, default=5,
+                        help="every Nth session is an employee journey (0 for customers only)")
+    parser.add_argument("--cars", type=int, default=500)
+    parser.add_argument("--customers", type=int, default=1000)
+    parser.add_argument("--reservations", type=int, default=20000)
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds a single rerun may take")
+    parser.add_argument("--db", default=os.path.join(tempfile.mkdtemp(), "loadtest.db"))
+    parser.add_argument("--output", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    # Must be set before app reads its configuration
+    os.environ.setdefault("DB_BACKEND", "sqlite")
+    os.environ["DB_SQLITE_PATH"] = args.db
+    # Every session logs in; keep the login rate limiter out of the way
+    os.environ.setdefault("AUTH_RATE_BURST", "1000000")
+
+    import app
+    import auth
+    from bench import seed
+
+    app.init_db()
+    with app.get_connection() as conn:
+        seed.seed_cars(conn, args.cars)
+        seed.seed_customers(conn, args.customers, password_hash=auth.hash_password(BENCH_PASSWORD))
+        seed.seed_reservations(conn, args.reservations, with_payments=True)
+
+    samples = {}
+    failures = []
+    start = time.perf_counter()
+    # Spawned workers import app themselves and inherit the backend settings above
+    with ProcessPoolExecutor(max_workers=args.concurrency, initializer=warm_up,
+                             mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = [pool.submit(run_journey, i, args.employee_every, args.customers, args.timeout)
+                   for i in range(args.sessions)]
+        for future in futures:
+            try:
+                role, journey = future.result()
+            except Exception as e:
+                failures.append(str(e))
+                continue
+            for page, latency, db_calls in journey:
+                samples.setdefault((role, page), []).append((latency, db_calls))
+    elapsed = time.perf_counter() - start
+
+    renders = sum(len(page_samples) for page_samples in samples.values())
+    results = []
+    print(f"{'role':<9} {'page':<28} {'renders':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'db calls':>8}")
+    for (role, page), page_samples in sorted(samples.items()):
+        stats = summarize([latency for latency, _ in page_samples])
+        db_calls = sum(calls for _, calls in page_samples) / len(page_samples)
+        results.append({"role": role, "page": page, "db_calls_per_step": db_calls, **stats})
+        print(f"{role:<9} {page:<28} {stats['samples']:>7} {stats['p50_ms']:>9.1f} "
+              f"{stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f} {db_calls:>8.1f}")
+
+    print(f"\n{args.sessions} sessions, {args.concurrency} concurrent, {len(failures)} failed, "
+          f"{elapsed:.1f}s, {renders / elapsed:.1f} renders/s "
+          f"({renders / elapsed / args.concurrency:.1f} per worker)")
+    for failure in failures[:10]:
+        print(f"  {failure}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "generated_at": datetime.datetime.now().isoformat(timespec="seconds"),
+                "backend": app.DB_BACKEND,
+                "config": vars(args),
+                "elapsed": elapsed,
+                "failed_sessions": len(failures),
+                "results": results,
+            }, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import datetime
+import random
+
+# Synthetic data for benchmarks. Expects a freshly migrated database.
+
+RESERVATION_STATUSES = ["Pending", "Active", "Completed", "Cancelled"]
+RESERVATION_STATUS_WEIGHTS = [10, 5, 70, 15]
+
+def insert_in_batches(conn, sql, rows, batch_size):
+    with conn.cursor() as cursor:
+        for start in range(0, len(rows), batch_size):
+            cursor.executemany(sql, rows[start:start + batch_size])
+            conn.commit()
+
+def seed_cars(conn, count, batch_size=10000, start=0):
+    rows = [(f"Model {i % 50}", f"BENCH{i:07d}", 30 + (i * 7) % 120) for i in range(start, start + count)]
+    insert_in_batches(conn, "INSERT INTO car (model, plate_no, daily_price) VALUES (:1, :2, :3)", rows, batch_size)
+
+def seed_customers(conn, count, batch_size=10000, start=0, password_hash="x"):
+    users = [(f"bench_user_{i}", password_hash, "Customer") for i in range(start, start + count)]
+    insert_in_batches(conn, "INSERT INTO users (username, password, user_type) VALUES (:1, :2, :3)", users, batch_size)
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT user_id, username FROM users WHERE username LIKE 'bench_user_%'")
+        user_ids = {username: user_id for user_id, username in cursor}
+    customers = [(user_ids[f"bench_user_{i}"], f"Customer {i}", f"c{i}@example.com") for i in range(start, start + count)]
+    insert_in_batches(conn, "INSERT INTO customer (user_id, name, email) VALUES (:1, :2, :3)", customers, batch_size)
+
+def fetch_ids(conn, sql):
+    with conn.cursor() as cursor:
+        cursor.execute(sql)
+        return [row[0] for row in cursor]
+
+def seed_reservations(conn, count, batch_size=10000, rng=None, with_payments=False):
+    # Rentals of one to three days over the next year. With with_payments each
+    # reservation also gets its payment, Paid once the reservation went ahead.
+    # Pass one rng when growing a table over several calls; without one the
+    # seed is the current row count, so each call still draws new rows.
+    rng = rng or random.Random(fetch_ids(conn, "SELECT COUNT(*) FROM reserve")[0])
+    customer_ids = fetch_ids(conn, "SELECT customer_id FROM customer")
+    today = datetime.date.today()
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT car_id, daily_price FROM car")
+        prices = dict(cursor.fetchall())
+        car_ids = list(prices)
+        for start in range(0, count, batch_size):
+            last_resv_id = fetch_ids(conn, "SELECT NVL(MAX(resv_id), 0) FROM reserve")[0]
+            rows = []
+            for _ in range(min(batch_size, count - start)):
+                pickup = today + datetime.timedelta(days=rng.randint(1, 365))
+                return_day = pickup + datetime.timedelta(days=rng.randint(0, 2))
+                status = rng.choices(RESERVATION_STATUSES, RESERVATION_STATUS_WEIGHTS)[0]
+                rows.append((rng.choice(customer_ids), rng.choice(car_ids),
+                             pickup.strftime("%Y-%m-%d"), return_day.strftime("%Y-%m-%d"), status))
+            cursor.executemany('''
+                INSERT INTO reserve (customer_id, car_id, pickup_day, return_day, status)
+                VALUES (:1, :2, TO_DATE(:3, 'YYYY-MM-DD'), TO_DATE(:4, 'YYYY-MM-DD'), :5)
+            ''', rows)
+            
+            if with_payments:
+                cursor.execute('''
+                    SELECT resv_id, customer_id, car_id,
+                           TO_CHAR(pickup_day, 'YYYY-MM-DD'), TO_CHAR(return_day, 'YYYY-MM-DD'), status
+                    FROM reserve
+                    WHERE resv_id > :1
+                ''', [last_resv_id])
+                payments = []
+                for resv_id, customer_id, car_id, pickup, return_day, status in cursor.fetchall():
+                    pickup = datetime.date.fromisoformat(pickup)
+                    days = (datetime.date.fromisoformat(return_day) - pickup).days + 1
+                    pay_status = "Paid" if status in ("Active", "Completed") else "Pending"
+                    payments.append((customer_id, resv_id, prices[car_id] * days,
+                                     (pickup + datetime.timedelta(days=1)).strftime("%Y-%m-%d"), pay_status))
+                cursor.executemany('''
+                    INSERT INTO payments (customer_id, resv_id, amount, due_date, pay_status)
+                    VALUES (:1, :2, :3, TO_DATE(:4, 'YYYY-MM-DD'), :5)
+                ''', payments)
+            conn.commit()
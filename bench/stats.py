@@ -0,0 +1,22 @@
+import statistics
+
+# Latency summaries shared by the benchmarks
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def summarize(latencies, rows=0):
+    # latencies in seconds; rows is the total returned or written across samples
+    total = sum(latencies)
+    return {
+        "samples": len(latencies),
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "rows": rows,
+        "rows_per_second": rows / total if total else 0.0,
+    }
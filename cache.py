@@ -0,0 +1,112 @@
+import streamlit as st
+import os
+import time
+import threading
+
+# Seconds a cached car catalog / availability read stays fresh
+CATALOG_CACHE_TTL = float(os.getenv("CATALOG_CACHE_TTL", "60"))
+
+class ReadThroughCache:
+    # Keys are tuples whose first element names the dataset, e.g. ("all_cars",).
+    # Only one caller loads a missing key; concurrent callers wait and reuse it.
+    # Every caller gets the same cached object, so values must not be mutated.
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.entries = {}
+        self.key_locks = {}
+        # Bumped by invalidate(); a load that straddles one is not stored
+        self.generations = {}
+        self.cleared = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def lookup(self, key, ttl):
+        entry = self.entries.get(key)
+        if entry and time.time() - entry[0] < ttl:
+            return entry
+        return None
+    
+    def generation(self, key):
+        return self.cleared, self.generations.get(key[0], 0)
+    
+    def store(self, key, value, generation):
+        # Called with self.lock held. A load that started before an
+        # invalidation may hold pre-write data, so it is returned but not kept.
+        if self.generation(key) == generation:
+            self.entries[key] = (time.time(), value)
+
+    def get(self, key, loader, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        with self.lock:
+            entry = self.lookup(key, ttl)
+            if entry:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            key_lock = self.key_locks.setdefault(key, threading.Lock())
+        
+        with key_lock:
+            with self.lock:
+                entry = self.lookup(key, ttl)
+                generation = self.generation(key)
+            if entry:
+                return entry[1]
+            # Loader errors propagate and nothing is cached
+            value = loader()
+            with self.lock:
+                self.store(key, value, generation)
+            return value
+
+    async def get_async(self, key, loader, ttl=None):
+        # For coroutine loaders on the async event loop. No single-flight here:
+        # a key lock would block the loop, so concurrent misses each load.
+        ttl = self.ttl if ttl is None else ttl
+        with self.lock:
+            entry = self.lookup(key, ttl)
+            if entry:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self.generation(key)
+        
+        value = await loader()
+        with self.lock:
+            self.store(key, value, generation)
+        return value
+    
+    def invalidate(self, *names):
+        with self.lock:
+            for key in list(self.entries):
+                if not names or key[0] in names:
+                    del self.entries[key]
+            if names:
+                for name in names:
+                    self.generations[name] = self.generations.get(name, 0) + 1
+            else:
+                self.cleared += 1
+            self.invalidations += 1
+
+    def stats(self):
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+                "entries": len(self.entries),
+                "invalidations": self.invalidations
+            }
+
+# Shared by every session in the process
+@st.cache_resource
+def get_catalog_cache():
+    return ReadThroughCache(CATALOG_CACHE_TTL)
+
+def invalidate_catalog(*names):
+    # No names clears the whole catalog cache
+    get_catalog_cache().invalidate(*names)
+
+def get_cache_stats():
+    return get_catalog_cache().stats()
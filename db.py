@@ -0,0 +1,112 @@
+import streamlit as st
+import pandas as pd
+import oracledb
+import os
+import time
+import contextvars
+import sqlite_backend
+from metrics import count_rerun_stat, InstrumentedConnection
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+# Database configuration
+DB_BACKEND = os.getenv("DB_BACKEND", "oracle")  # "oracle" or "sqlite"
+DB_SQLITE_PATH = os.getenv("DB_SQLITE_PATH", "car_rental.db")
+DB_USER = os.getenv("DB_USER", "new_user")
+DB_PASSWORD = os.getenv("DB_PASSWORD", "password")
+DB_HOST = os.getenv("DB_HOST", "localhost")
+DB_PORT = os.getenv("DB_PORT", "1521")
+DB_SERVICE = os.getenv("DB_SERVICE", "XEPDB1")
+
+# Connection pool configuration
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "2"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "10"))
+DB_POOL_INCREMENT = int(os.getenv("DB_POOL_INCREMENT", "1"))
+DB_POOL_PING_INTERVAL = int(os.getenv("DB_POOL_PING_INTERVAL", "0"))  # 0 = ping on every acquire
+DB_POOL_WAIT_TIMEOUT = int(os.getenv("DB_POOL_WAIT_TIMEOUT", "5000"))  # milliseconds
+DB_STMT_CACHE_SIZE = int(os.getenv("DB_STMT_CACHE_SIZE", "40"))
+# Cross-worker invalidation bus, see app.get_invalidation_bus()
+CACHE_BUS = os.getenv("CACHE_BUS", "local")
+# Oracle Instant Client directory, for Thick mode (needed by CACHE_BUS=cqn)
+ORACLE_CLIENT_LIB_DIR = os.getenv("ORACLE_CLIENT_LIB_DIR")
+
+# One pool per process, shared by every session and every rerun
+@st.cache_resource
+def get_pool():
+    if DB_BACKEND == "sqlite":
+        return sqlite_backend.create_pool(
+            DB_SQLITE_PATH,
+            min=DB_POOL_MIN,
+            max=DB_POOL_MAX,
+            increment=DB_POOL_INCREMENT,
+            ping_interval=DB_POOL_PING_INTERVAL,
+            wait_timeout=DB_POOL_WAIT_TIMEOUT,
+            stmtcachesize=DB_STMT_CACHE_SIZE
+        )
+    
+    if CACHE_BUS == "cqn":
+        # Change notification is Thick mode only, and the mode is fixed by the
+        # first connection the process makes
+        oracledb.init_oracle_client(lib_dir=ORACLE_CLIENT_LIB_DIR)
+    
+    return oracledb.create_pool(
+        user=DB_USER,
+        password=DB_PASSWORD,
+        dsn=f"{DB_HOST}:{DB_PORT}/{DB_SERVICE}",
+        min=DB_POOL_MIN,
+        max=DB_POOL_MAX,
+        increment=DB_POOL_INCREMENT,
+        ping_interval=DB_POOL_PING_INTERVAL,
+        getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+        wait_timeout=DB_POOL_WAIT_TIMEOUT,
+        stmtcachesize=DB_STMT_CACHE_SIZE
+    )
+
+# Milliseconds each round trip may take on connections acquired in this
+# context; 0 is no limit. Set for prefetched reads.
+call_timeout = contextvars.ContextVar("call_timeout", default=0)
+
+def get_connection():
+    # Borrow a session from the pool; closing it (end of the with block) returns it
+    count_rerun_stat("acquires")
+    start = time.perf_counter()
+    conn = get_pool().acquire()
+    # Always set, since pooled connections keep the last value
+    conn.call_timeout = call_timeout.get()
+    return InstrumentedConnection(conn, time.perf_counter() - start)
+
+def get_pool_stats():
+    pool = get_pool()
+    return {
+        "opened": pool.opened,
+        "busy": pool.busy,
+        "min": pool.min,
+        "max": pool.max,
+        "increment": pool.increment,
+        "ping_interval": pool.ping_interval,
+        "stmtcachesize": pool.stmtcachesize
+    }
+
+# Rows per fetch round trip for list queries
+FETCH_ARRAYSIZE = int(os.getenv("DB_FETCH_ARRAYSIZE", "1000"))
+# Use oracledb's Arrow fetch (python-oracledb 3+, needs pyarrow) for DataFrame reads
+DB_ARROW_FETCH = os.getenv("DB_ARROW_FETCH", "0") == "1"
+
+def fetch_dataframe(conn, sql, params=None, columns=None):
+    # Builds the DataFrame straight from the fetched rows (or Arrow arrays)
+    # instead of a dict per row
+    if DB_ARROW_FETCH and pyarrow is not None and hasattr(conn, "fetch_df_all"):
+        odf = conn.fetch_df_all(statement=sql, parameters=params or [], arraysize=FETCH_ARRAYSIZE)
+        df = pyarrow.Table.from_arrays(odf.column_arrays(), names=odf.column_names()).to_pandas()
+    else:
+        with conn.cursor() as cursor:
+            cursor.arraysize = FETCH_ARRAYSIZE
+            cursor.prefetchrows = FETCH_ARRAYSIZE + 1
+            cursor.execute(sql, params or [])
+            df = pd.DataFrame.from_records(cursor.fetchall(), columns=[d[0] for d in cursor.description])
+    
+    df.columns = columns or [name.lower() for name in df.columns]
+    return df
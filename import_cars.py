@@ -0,0 +1,34 @@
+import argparse
+import sys
+import oracledb
+import app
+
+# Bulk-load cars from a CSV or Parquet file with columns model, plate_no, daily_price
+#
+#   python import_cars.py fleet.csv
+#   python import_cars.py fleet.parquet --chunk-size 10000
+
+def main():
+    parser = argparse.ArgumentParser(description="Import cars from a CSV or Parquet file")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "parquet"],
+                        help="defaults to the file extension")
+    parser.add_argument("--chunk-size", type=int, default=app.CAR_IMPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    file_format = args.format or ("parquet" if args.path.lower().endswith(".parquet") else "csv")
+
+    try:
+        app.init_db()
+        report = app.import_cars(args.path, file_format, args.chunk_size)
+    except (ValueError, KeyError, OSError, oracledb.DatabaseError) as e:
+        print(f"Import failed: {e}")
+        sys.exit(1)
+
+    for failure in report["failed"]:
+        print(f"Row {failure['row']} ({failure['plate_no']}): {failure['reason']}")
+    print(f"\nImported {report['inserted']} cars, {len(report['failed'])} rejected "
+          f"in {report['elapsed']:.2f}s ({report['rows_per_second']:.0f} rows/s)")
+
+if __name__ == "__main__":
+    main()
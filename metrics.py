@@ -0,0 +1,406 @@
+import streamlit as st
+import oracledb
+import hashlib
+import os
+import time
+import bisect
+import threading
+import contextvars
+import collections
+import functools
+import re
+
+# Counters for the current script run, installed by app.main(); "session"
+# points at the session's running totals
+rerun_stats = contextvars.ContextVar("rerun_stats", default=None)
+# Prefetch threads share their page's dict
+rerun_stats_lock = threading.Lock()
+
+def count_rerun_stat(name):
+    stats = rerun_stats.get()
+    if stats is not None:
+        with rerun_stats_lock:
+            stats[name] += 1
+            stats["session"][name] += 1
+
+# Set by background threads so their statements stay out of the page numbers
+background_task = contextvars.ContextVar("background_task", default=None)
+
+# Every statement is timed and kept in a ring buffer; slow ones are also logged
+QUERY_LOG_SIZE = int(os.getenv("QUERY_LOG_SIZE", "1000"))
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+@functools.lru_cache(maxsize=512)
+def fingerprint_sql(sql):
+    # Literals become ? and whitespace collapses, so one statement shape is one fingerprint
+    sql = re.sub(r"'(?:[^']|'')*'", "?", sql)
+    sql = re.sub(r"(?<![:\w])\d+(\.\d+)?", "?", sql)
+    return " ".join(sql.split())
+
+@functools.lru_cache(maxsize=512)
+def query_id(fingerprint):
+    return hashlib.sha1(fingerprint.encode()).hexdigest()[:10]
+
+class LatencyHistogram:
+    def __init__(self):
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        index = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+        if index < len(self.buckets):
+            self.buckets[index] += 1
+    
+    def prometheus(self, name, labels=""):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.buckets):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels}{"," if labels else ""}le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels}{"," if labels else ""}le="+Inf"}} {self.count}')
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{suffix} {self.total:.6f}")
+        lines.append(f"{name}_count{suffix} {self.count}")
+        return lines
+
+class QueryMetrics:
+    def __init__(self, size, slow_ms):
+        self.slow_seconds = slow_ms / 1000
+        self.recent = collections.deque(maxlen=size)
+        self.slow = collections.deque(maxlen=size)
+        self.queries = {}  # query_id -> fingerprint, histogram, rows, errors
+        self.pages = {}  # page -> statements run
+        self.reruns = {}  # page -> script runs
+        self.prefetch_timeouts = {}  # (page, prefetched query) -> count
+        self.background = {}  # background task -> histogram, rows, errors, slow
+        self.acquire = LatencyHistogram()
+        self.lock = threading.Lock()
+    
+    def record_acquire(self, seconds):
+        with self.lock:
+            self.acquire.observe(seconds)
+    
+    def record_rerun(self, page):
+        with self.lock:
+            self.reruns[page] = self.reruns.get(page, 0) + 1
+    
+    def record_prefetch_timeout(self, page, name):
+        with self.lock:
+            key = (page or "none", name)
+            self.prefetch_timeouts[key] = self.prefetch_timeouts.get(key, 0) + 1
+        print(f"Error in prefetch: {name} on page {page} timed out")
+    
+    def record_query(self, record):
+        if record["task"] is not None:
+            self.record_background_query(record)
+            return
+        with self.lock:
+            self.recent.append(record)
+            entry = self.queries.get(record["query_id"])
+            if entry is None:
+                entry = self.queries[record["query_id"]] = {
+                    "fingerprint": record["fingerprint"],
+                    "latency": LatencyHistogram(),
+                    "rows": 0,
+                    "errors": 0
+                }
+            entry["latency"].observe(record["elapsed"])
+            entry["rows"] += record["rows"]
+            entry["errors"] += record["error"] is not None
+            page = record["page"] or "none"
+            self.pages[page] = self.pages.get(page, 0) + 1
+            slow = record["elapsed"] >= self.slow_seconds
+            if slow:
+                self.slow.append(record)
+        
+        if slow:
+            print(f"Slow query {record['query_id']} on page {record['page']}: "
+                  f"{record['elapsed'] * 1000:.1f} ms, {record['rows']} rows, "
+                  f"acquire {record['acquire'] * 1000:.1f} ms: {record['fingerprint'][:200]}")
+    
+    def record_background_query(self, record):
+        slow = record["elapsed"] >= self.slow_seconds
+        with self.lock:
+            entry = self.background.get(record["task"])
+            if entry is None:
+                entry = self.background[record["task"]] = {
+                    "latency": LatencyHistogram(),
+                    "rows": 0,
+                    "errors": 0,
+                    "slow": 0
+                }
+            entry["latency"].observe(record["elapsed"])
+            entry["rows"] += record["rows"]
+            entry["errors"] += record["error"] is not None
+            entry["slow"] += slow
+        
+        if slow:
+            print(f"Slow query {record['query_id']} in {record['task']}: "
+                  f"{record['elapsed'] * 1000:.1f} ms, {record['rows']} rows: {record['fingerprint'][:200]}")
+    
+    def recent_queries(self):
+        with self.lock:
+            return list(self.recent)
+    
+    def slow_queries(self):
+        with self.lock:
+            return list(self.slow)
+    
+    def query_summary(self):
+        with self.lock:
+            return [{
+                "query_id": qid,
+                "calls": entry["latency"].count,
+                "mean_ms": entry["latency"].total / entry["latency"].count * 1000,
+                "max_ms": entry["latency"].max * 1000,
+                "total_ms": entry["latency"].total * 1000,
+                "rows": entry["rows"],
+                "errors": entry["errors"],
+                "fingerprint": entry["fingerprint"]
+            } for qid, entry in self.queries.items() if entry["latency"].count]
+    
+    def page_summary(self):
+        # Statements per script run of each page, i.e. DB round trips per rerun
+        with self.lock:
+            return [{
+                "page": page,
+                "reruns": reruns,
+                "statements": self.pages.get(page, 0),
+                "per_rerun": self.pages.get(page, 0) / reruns
+            } for page, reruns in self.reruns.items()]
+    
+    def prefetch_timeout_summary(self):
+        with self.lock:
+            return [{"page": page, "query": name, "timeouts": count}
+                    for (page, name), count in self.prefetch_timeouts.items()]
+    
+    def background_summary(self):
+        with self.lock:
+            return [{
+                "task": task,
+                "calls": entry["latency"].count,
+                "mean_ms": entry["latency"].total / entry["latency"].count * 1000,
+                "max_ms": entry["latency"].max * 1000,
+                "rows": entry["rows"],
+                "errors": entry["errors"],
+                "slow": entry["slow"]
+            } for task, entry in self.background.items()]
+    
+    def prometheus(self):
+        with self.lock:
+            lines = [
+                "# HELP car_rental_query_seconds Time spent executing and fetching each statement",
+                "# TYPE car_rental_query_seconds histogram"
+            ]
+            for qid, entry in self.queries.items():
+                lines.extend(entry["latency"].prometheus("car_rental_query_seconds", f'query="{qid}"'))
+            lines += ["# HELP car_rental_query_rows_total Rows fetched or changed",
+                      "# TYPE car_rental_query_rows_total counter"]
+            lines += [f'car_rental_query_rows_total{{query="{qid}"}} {entry["rows"]}' for qid, entry in self.queries.items()]
+            lines += ["# HELP car_rental_query_errors_total Statements that raised a database error",
+                      "# TYPE car_rental_query_errors_total counter"]
+            lines += [f'car_rental_query_errors_total{{query="{qid}"}} {entry["errors"]}' for qid, entry in self.queries.items()]
+            lines += ["# HELP car_rental_page_queries_total Statements run while rendering each page",
+                      "# TYPE car_rental_page_queries_total counter"]
+            lines += [f'car_rental_page_queries_total{{page="{page}"}} {count}' for page, count in self.pages.items()]
+            lines += ["# HELP car_rental_prefetch_timeouts_total Prefetched reads a page stopped waiting for",
+                      "# TYPE car_rental_prefetch_timeouts_total counter"]
+            lines += [f'car_rental_prefetch_timeouts_total{{page="{page}",query="{name}"}} {count}'
+                      for (page, name), count in self.prefetch_timeouts.items()]
+            lines += ["# HELP car_rental_background_query_seconds Time spent on statements run by background threads",
+                      "# TYPE car_rental_background_query_seconds histogram"]
+            for task, entry in self.background.items():
+                lines.extend(entry["latency"].prometheus("car_rental_background_query_seconds", f'task="{task}"'))
+            lines += ["# HELP car_rental_pool_acquire_seconds Time spent waiting for a pooled connection",
+                      "# TYPE car_rental_pool_acquire_seconds histogram"]
+            lines += self.acquire.prometheus("car_rental_pool_acquire_seconds")
+            lines += ["# HELP car_rental_slow_queries_total Statements slower than the slow-query threshold",
+                      "# TYPE car_rental_slow_queries_total counter",
+                      f"car_rental_slow_queries_total {len(self.slow)}"]
+        return "\n".join(lines) + "\n"
+
+# Shared by every session in the process
+@st.cache_resource
+def get_query_metrics():
+    return QueryMetrics(QUERY_LOG_SIZE, SLOW_QUERY_MS)
+
+def export_prometheus_metrics():
+    return get_query_metrics().prometheus()
+
+def new_query_record(sql, acquire_time):
+    # Every statement recorded is one DB call for the current rerun
+    count_rerun_stat("db_calls")
+    fingerprint = fingerprint_sql(sql)
+    stats = rerun_stats.get()
+    return {
+        "query_id": query_id(fingerprint),
+        "fingerprint": fingerprint,
+        "page": stats["page"] if stats else None,
+        "task": background_task.get(),
+        "acquire": acquire_time,
+        "elapsed": 0.0,
+        "rows": 0,
+        "fetched": False,
+        "error": None,
+        "at": time.time()
+    }
+
+class InstrumentedCursor:
+    # Times execute plus every fetch of its result, and records the statement
+    # when the next one starts or the cursor closes
+    def __init__(self, cursor, connection):
+        self._cursor = cursor
+        self._connection = connection
+        self._record = None
+    
+    def _start(self, sql):
+        self._finish()
+        self._record = new_query_record(sql, self._connection.acquire_time)
+    
+    def _finish(self):
+        record, self._record = self._record, None
+        if record is None:
+            return
+        if not record.pop("fetched") and record["error"] is None:
+            # DML: rows changed rather than rows fetched
+            record["rows"] = max(self._cursor.rowcount or 0, 0)
+        self._connection.metrics.record_query(record)
+    
+    def _timed(self, method, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        except oracledb.DatabaseError as e:
+            if self._record is not None:
+                error, = e.args
+                self._record["error"] = getattr(error, "full_code", str(error))
+            raise
+        finally:
+            if self._record is not None:
+                self._record["elapsed"] += time.perf_counter() - start
+    
+    def _fetched(self, rows):
+        if self._record is not None:
+            self._record["fetched"] = True
+            self._record["rows"] += rows
+    
+    def execute(self, sql, params=None, **kwargs):
+        self._start(sql)
+        self._timed(self._cursor.execute, sql, params if params is not None else [], **kwargs)
+        return self
+    
+    def executemany(self, sql, seq_of_params, **kwargs):
+        self._start(sql)
+        return self._timed(self._cursor.executemany, sql, seq_of_params, **kwargs)
+    
+    def callproc(self, name, params=None, **kwargs):
+        self._start(f"CALL {name}")
+        return self._timed(self._cursor.callproc, name, params or [], **kwargs)
+    
+    def callfunc(self, name, return_type, params=None, **kwargs):
+        self._start(f"CALL {name}")
+        return self._timed(self._cursor.callfunc, name, return_type, params or [], **kwargs)
+    
+    def fetchone(self):
+        row = self._timed(self._cursor.fetchone)
+        self._fetched(1 if row is not None else 0)
+        return row
+    
+    def fetchmany(self, size=None):
+        rows = self._timed(self._cursor.fetchmany, size) if size else self._timed(self._cursor.fetchmany)
+        self._fetched(len(rows))
+        return rows
+    
+    def fetchall(self):
+        rows = self._timed(self._cursor.fetchall)
+        self._fetched(len(rows))
+        return rows
+    
+    def __iter__(self):
+        # The driver's own iterator (it fetches arraysize rows per round trip),
+        # timed once for the whole loop, consumer time between rows included
+        start = time.perf_counter()
+        rows = 0
+        try:
+            for row in self._cursor:
+                rows += 1
+                yield row
+        except oracledb.DatabaseError as e:
+            if self._record is not None:
+                error, = e.args
+                self._record["error"] = getattr(error, "full_code", str(error))
+            raise
+        finally:
+            if self._record is not None:
+                self._record["elapsed"] += time.perf_counter() - start
+            self._fetched(rows)
+    
+    def close(self):
+        self._finish()
+        self._connection._cursors.discard(self)
+        self._cursor.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def __getattr__(self, name):
+        # description, rowcount, arraysize, var(), getbatcherrors(), ...
+        return getattr(self._cursor, name)
+    
+    def __setattr__(self, name, value):
+        if name.startswith("_"):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._cursor, name, value)
+
+class InstrumentedConnection:
+    def __init__(self, conn, acquire_time):
+        self._conn = conn
+        self._cursors = set()
+        self.acquire_time = acquire_time
+        self.metrics = get_query_metrics()
+        self.metrics.record_acquire(acquire_time)
+    
+    def cursor(self):
+        cursor = InstrumentedCursor(self._conn.cursor(), self)
+        self._cursors.add(cursor)
+        return cursor
+    
+    def close(self):
+        # Statements whose cursor was never closed are recorded here
+        for cursor in self._cursors:
+            cursor._finish()
+        self._cursors = set()
+        self._conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def __getattr__(self, name):
+        if name == "fetch_df_all":
+            getattr(self._conn, name)  # AttributeError when the driver has no Arrow fetch
+            return self._timed_fetch_df_all
+        # commit, rollback, ping, ...
+        return getattr(self._conn, name)
+    
+    def _timed_fetch_df_all(self, statement, parameters=None, **kwargs):
+        cursor = InstrumentedCursor(None, self)
+        cursor._start(statement)
+        try:
+            odf = cursor._timed(self._conn.fetch_df_all, statement=statement, parameters=parameters, **kwargs)
+            cursor._fetched(odf.num_rows())
+            return odf
+        finally:
+            cursor._finish()
@@ -0,0 +1,711 @@
+import streamlit as st
+import oracledb
+import sqlite_backend
+from db import DB_BACKEND, get_connection
+from auth import hash_password
+
+def migrate_base_schema(cursor):
+    # Create users table
+    try:
+        cursor.execute("SELECT COUNT(*) FROM user_tables WHERE table_name = 'USERS'")
+        (table_exists,) = cursor.fetchone()
+
+        if not table_exists:
+            cursor.execute('''
+                CREATE TABLE users (
+                    user_id NUMBER GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+                    username VARCHAR2(100) UNIQUE NOT NULL,
+                    password VARCHAR2(255) NOT NULL,
+                    user_type VARCHAR2(50) NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+    except oracledb.DatabaseError as e:
+        error, = e.args
+        if error.code != 955:  # Table already exists
+            raise
+    
+    # Create customer table
+    try:
+        cursor.execute("SELECT COUNT(*) FROM user_tables WHERE table_name = 'CUSTOMER'")
+        (table_exists,) = cursor.fetchone()
+
+        if not table_exists:
+            cursor.execute('''
+            CREATE TABLE customer (
+                customer_id NUMBER GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+                user_id NUMBER,
+                name VARCHAR2(100) NOT NULL,
+                email VARCHAR2(100),
+                phone VARCHAR2(50),
+                address VARCHAR2(200),
+                street VARCHAR2(100),
+                city VARCHAR2(100),
+                id_number VARCHAR2(20),
+                license VARCHAR2(20),
+                CONSTRAINT fk_customer_user_id FOREIGN KEY (user_id) REFERENCES users(user_id)
+            )
+            ''')
+    except oracledb.DatabaseError as e:
+        error, = e.args
+        if error.code != 955:
+            raise
+    
+    # Create employee table
+    try:
+        cursor.execute("SELECT COUNT(*) FROM user_tables WHERE table_name = 'EMPLOYEE'")
+        (table_exists,) = cursor.fetchone()
+
+        if not table_exists:
+            cursor.execute('''
+            CREATE TABLE employee (
+                emp_id NUMBER GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+                user_id NUMBER,
+                name VARCHAR2(100) NOT NULL,
+                email VARCHAR2(100),
+                phone VARCHAR2(50),
+                address VARCHAR2(200),
+                street VARCHAR2(100),
+                city VARCHAR2(100),
+                CONSTRAINT fk_employee_user_id FOREIGN KEY (user_id) REFERENCES users(user_id)
+            )
+            ''')
+    except oracledb.DatabaseError as e:
+        error, = e.args
+        if error.code != 955:
+            raise
+    
+    # Create car table
+    try:
+        cursor.execute("SELECT COUNT(*) FROM user_tables WHERE table_name = 'CAR'")
+        (table_exists,) = cursor.fetchone()
+
+        if not table_exists:
+            cursor.execute('''
+            CREATE TABLE car (
+                car_id NUMBER GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+                model VARCHAR2(100) NOT NULL,
+                plate_no VARCHAR2(20) UNIQUE NOT NULL,
+                daily_price NUMBER NOT NULL
+            )
+            ''')
+    except oracledb.DatabaseError as e:
+        error, = e.args
+        if error.code != 955:
+            raise
+    
+    # Create reservation table
+    try:
+        cursor.execute("SELECT COUNT(*) FROM user_tables WHERE table_name = 'RESERVE'")
+        (table_exists,) = cursor.fetchone()
+
+        if not table_exists:
+            cursor.execute('''
+            CREATE TABLE reserve (
+                resv_id NUMBER GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+                customer_id NUMBER NOT NULL,
+                car_id NUMBER NOT NULL,
+                pickup_day DATE NOT NULL,
+                reserve_date DATE DEFAULT CURRENT_DATE,
+                status VARCHAR2(50) DEFAULT 'Pending',
+                CONSTRAINT fk_reserve_customer FOREIGN KEY (customer_id) REFERENCES customer(customer_id),
+                CONSTRAINT fk_reserve_car FOREIGN KEY (car_id) REFERENCES car(car_id)
+            )
+            ''')
+    except oracledb.DatabaseError as e:
+        error, = e.args
+        if error.code != 955:
+            raise
+    
+    # Create payments table
+    try:
+        cursor.execute("SELECT COUNT(*) FROM user_tables WHERE table_name = 'PAYMENTS'")
+        (table_exists,) = cursor.fetchone()
+
+        if not table_exists:
+            cursor.execute('''
+            CREATE TABLE payments (
+                pay_id NUMBER GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+                customer_id NUMBER NOT NULL,
+                amount NUMBER NOT NULL,
+                pay_date DATE DEFAULT CURRENT_DATE,
+                due_date DATE,
+                method VARCHAR2(50),
+                pay_status VARCHAR2(50) DEFAULT 'Pending',
+                employee_id NUMBER,
+                CONSTRAINT fk_payments_customer FOREIGN KEY (customer_id) REFERENCES customer(customer_id),
+                CONSTRAINT fk_payments_employee FOREIGN KEY (employee_id) REFERENCES employee(emp_id)
+            )
+            ''')
+    except oracledb.DatabaseError as e:
+        error, = e.args
+        if error.code != 955:
+            raise
+    
+    # Add trigger to check reservation date
+    try:
+        cursor.execute("""
+        CREATE OR REPLACE TRIGGER check_reservation_date
+        BEFORE INSERT ON reserve
+        FOR EACH ROW
+        DECLARE
+            v_days NUMBER;
+        BEGIN
+            v_days := :NEW.pickup_day - CURRENT_DATE;
+            IF v_days < 0 THEN
+                RAISE_APPLICATION_ERROR(-20001, 'Pickup date cannot be before current date');
+            END IF;
+        END;
+        """)
+    except oracledb.DatabaseError as e:
+        error, = e.args
+        if error.code != 4081:  # Trigger already exists
+            raise
+    
+    # Payment trigger: activates reservations once they are paid
+    try:
+        cursor.execute("""
+        CREATE OR REPLACE TRIGGER payment_status_trigger
+        FOR UPDATE OF pay_status ON payments
+        COMPOUND TRIGGER
+        
+        -- Global variables for the trigger
+        v_customer_id NUMBER;
+        v_pay_id NUMBER;
+        
+        -- BEFORE EACH ROW section to capture values
+        BEFORE EACH ROW IS
+        BEGIN
+            IF :NEW.pay_status = 'Paid' THEN
+                v_customer_id := :NEW.customer_id;
+                v_pay_id := :NEW.pay_id;
+            END IF;
+        END BEFORE EACH ROW;
+        
+        -- AFTER STATEMENT section to perform the update
+        AFTER STATEMENT IS
+        BEGIN
+            IF v_customer_id IS NOT NULL THEN
+                UPDATE reserve r
+                SET r.status = 'Active'
+                WHERE r.customer_id = v_customer_id
+                AND r.status = 'Pending'
+                AND EXISTS (
+                    SELECT 1 
+                    FROM payments p 
+                    WHERE p.customer_id = r.customer_id 
+                    AND p.pay_id = v_pay_id
+                );
+            END IF;
+        END AFTER STATEMENT;
+        
+        END payment_status_trigger;
+        """)
+    except oracledb.DatabaseError as e:
+        error, = e.args
+        if error.code != 4081:  # Trigger already exists
+            raise
+    
+    # Add PL/SQL procedure for updating reservation status
+    try:#PLSQL procedure is applied
+        cursor.execute("""
+        CREATE OR REPLACE PROCEDURE update_reservation_status_proc (
+            p_resv_id IN NUMBER,
+            p_status IN VARCHAR2,
+            p_success OUT NUMBER
+        ) IS
+        BEGIN
+            UPDATE reserve 
+            SET status = p_status
+            WHERE resv_id = p_resv_id;
+            
+            IF SQL%ROWCOUNT > 0 THEN
+                p_success := 1;
+                COMMIT;
+            ELSE
+                p_success := 0;
+                ROLLBACK;
+            END IF;
+        EXCEPTION
+            WHEN OTHERS THEN
+                p_success := 0;
+                ROLLBACK;
+        END;
+        """)
+    except oracledb.DatabaseError as e:
+        error, = e.args
+        if error.code != 955:  # Procedure already exists
+            raise
+    
+    # Add PL/SQL function for getting customer info
+    try:
+        cursor.execute("""
+        CREATE OR REPLACE FUNCTION get_customer_info_func (
+            p_customer_id IN NUMBER
+        ) RETURN SYS_REFCURSOR IS
+            v_result SYS_REFCURSOR;
+        BEGIN
+            OPEN v_result FOR
+                SELECT name, email, phone, address, street, city, 
+                       id_number, license
+                FROM customer
+                WHERE customer_id = p_customer_id;
+            RETURN v_result;
+        END;
+        """)
+    except oracledb.DatabaseError as e:
+        error, = e.args
+        if error.code != 955:  # Function already exists
+            raise
+
+def seed_sample_data(cursor):
+    # Insert sample cars if none exist
+    cursor.execute("SELECT COUNT(*) FROM car")
+    car_count, = cursor.fetchone()
+    
+    if car_count == 0:
+        sample_cars = [
+            ('Toyota Camry', 'ABC123', 50),
+            ('Honda Accord', 'XYZ789', 55),
+            ('Tesla Model 3', 'EV1234', 85),
+            ('Ford Mustang', 'MST500', 75),
+            ('Jeep Cherokee', 'JEP321', 65)
+        ]
+        
+        cursor.executemany(
+            "INSERT INTO car (model, plate_no, daily_price) VALUES (:1, :2, :3)",
+            sample_cars
+        )
+    
+    # Insert admin user if none exists
+    cursor.execute("SELECT COUNT(*) FROM users WHERE username = 'admin'")
+    admin_count, = cursor.fetchone()
+    
+    if admin_count == 0:
+        admin_password = hash_password('admin123')
+        cursor.execute(
+            "INSERT INTO users (username, password, user_type) VALUES ('admin', :1, 'Employee')",
+            [admin_password]
+        )
+        
+        # Get the user_id for the admin
+        cursor.execute("SELECT user_id FROM users WHERE username = 'admin'")
+        admin_user_id, = cursor.fetchone()
+        
+        # Create an employee record for the admin
+        cursor.execute(
+            "INSERT INTO employee (user_id, name, email, phone, address) VALUES (:1, 'Admin User', 'admin@carental.com', '555-ADMIN', 'Main Office')",
+            [admin_user_id]
+        )
+
+def create_index(cursor, name, table, columns):
+    try:
+        cursor.execute(f"CREATE INDEX {name} ON {table} ({columns})")
+    except oracledb.DatabaseError as e:
+        error, = e.args
+        if error.code not in (955, 1408):  # Name already used / column list already indexed
+            raise
+
+def drop_index(cursor, name):
+    try:
+        cursor.execute(f"DROP INDEX {name}")
+    except oracledb.DatabaseError as e:
+        error, = e.args
+        if error.code != 1418:  # Index does not exist
+            raise
+
+# Secondary indexes for the hot lookups: (name, table, columns)
+HOT_PATH_INDEXES = [
+    ("idx_reserve_car_status", "reserve", "car_id, status"),
+    ("idx_reserve_customer_pickup", "reserve", "customer_id, pickup_day"),
+    ("idx_payments_status_due", "payments", "pay_status, due_date"),
+    ("idx_payments_customer_date", "payments", "customer_id, pay_date"),
+    ("idx_customer_user", "customer", "user_id"),
+    ("idx_employee_user", "employee", "user_id"),
+]
+
+def create_hot_path_indexes(cursor):
+    for name, table, columns in HOT_PATH_INDEXES:
+        create_index(cursor, name, table, columns)
+
+def add_reservation_return_day(cursor):
+    try:
+        cursor.execute("ALTER TABLE reserve ADD return_day DATE")
+    except oracledb.DatabaseError as e:
+        error, = e.args
+        if error.code != 1430:  # Column already exists
+            raise
+    
+    # Existing reservations are single-day rentals
+    cursor.execute("UPDATE reserve SET return_day = pickup_day WHERE return_day IS NULL")
+    
+    # Backs the date-range overlap probe in AVAILABLE_CARS_IN_RANGE_SQL
+    create_index(cursor, "idx_reserve_car_status_dates", "reserve", "car_id, status, pickup_day, return_day")
+
+def drop_reserve_car_status_index(cursor):
+    # idx_reserve_car_status_dates leads with the same (car_id, status) columns
+    # and serves the same probes, so the narrower index is only write overhead
+    drop_index(cursor, "idx_reserve_car_status")
+
+def create_reservation_paging_indexes(cursor):
+    # Keyset pagination walks (reserve_date, resv_id) newest first, optionally per status
+    create_index(cursor, "idx_reserve_date_id", "reserve", "reserve_date, resv_id")
+    create_index(cursor, "idx_reserve_status_date_id", "reserve", "status, reserve_date, resv_id")
+
+def create_dashboard_summary(cursor):
+    try:
+        cursor.execute('''
+        CREATE TABLE dashboard_summary (
+            stat_name VARCHAR2(50) PRIMARY KEY,
+            stat_value NUMBER NOT NULL,
+            refreshed_at NUMBER NOT NULL
+        )
+        ''')
+    except oracledb.DatabaseError as e:
+        error, = e.args
+        if error.code != 955:  # Table already exists
+            raise
+
+def drop_dashboard_summary(cursor):
+    # Nothing kept it current, so the dashboard reads the live aggregate instead
+    try:
+        cursor.execute("DROP TABLE dashboard_summary")
+    except oracledb.DatabaseError as e:
+        error, = e.args
+        if error.code != 942:  # Table does not exist
+            raise
+
+def make_payment_trigger_set_based(cursor):
+    # The original trigger kept only the last paid row, so a multi-row UPDATE
+    # activated reservations for one customer. Collect every paid row instead
+    # and activate them all with one bulk update after the statement.
+    cursor.execute("""
+    CREATE OR REPLACE TRIGGER payment_status_trigger
+    FOR UPDATE OF pay_status ON payments
+    COMPOUND TRIGGER
+    
+    TYPE id_list IS TABLE OF NUMBER INDEX BY PLS_INTEGER;
+    v_customer_ids id_list;
+    
+    AFTER EACH ROW IS
+    BEGIN
+        IF :NEW.pay_status = 'Paid' AND :OLD.pay_status <> 'Paid' THEN
+            v_customer_ids(v_customer_ids.COUNT + 1) := :NEW.customer_id;
+        END IF;
+    END AFTER EACH ROW;
+    
+    AFTER STATEMENT IS
+    BEGIN
+        FORALL i IN 1 .. v_customer_ids.COUNT
+            UPDATE reserve
+            SET status = 'Active'
+            WHERE customer_id = v_customer_ids(i)
+            AND status = 'Pending';
+        v_customer_ids.DELETE;
+    END AFTER STATEMENT;
+    
+    END payment_status_trigger;
+    """)
+
+def link_payments_to_reservations(cursor):
+    try:
+        cursor.execute('''
+        ALTER TABLE payments ADD resv_id NUMBER
+            CONSTRAINT fk_payments_reserve REFERENCES reserve(resv_id)
+        ''')
+    except oracledb.DatabaseError as e:
+        error, = e.args
+        if error.code != 1430:  # Column already exists
+            raise
+    
+    # Existing payments are due the day after their reservation's pickup
+    cursor.execute('''
+    UPDATE payments
+    SET resv_id = (
+        SELECT MIN(r.resv_id)
+        FROM reserve r
+        WHERE r.customer_id = payments.customer_id
+        AND r.pickup_day = payments.due_date - 1
+    )
+    WHERE resv_id IS NULL
+    ''')
+    
+    create_index(cursor, "idx_payments_resv", "payments", "resv_id")
+    
+    # Activate exactly the reservations whose payments were paid, instead of
+    # every pending reservation of the paying customer
+    cursor.execute("""
+    CREATE OR REPLACE TRIGGER payment_status_trigger
+    FOR UPDATE OF pay_status ON payments
+    COMPOUND TRIGGER
+    
+    TYPE id_list IS TABLE OF NUMBER INDEX BY PLS_INTEGER;
+    v_resv_ids id_list;
+    
+    AFTER EACH ROW IS
+    BEGIN
+        IF :NEW.pay_status = 'Paid' AND :OLD.pay_status <> 'Paid' AND :NEW.resv_id IS NOT NULL THEN
+            v_resv_ids(v_resv_ids.COUNT + 1) := :NEW.resv_id;
+        END IF;
+    END AFTER EACH ROW;
+    
+    AFTER STATEMENT IS
+    BEGIN
+        FORALL i IN 1 .. v_resv_ids.COUNT
+            UPDATE reserve
+            SET status = 'Active'
+            WHERE resv_id = v_resv_ids(i)
+            AND status = 'Pending';
+        v_resv_ids.DELETE;
+    END AFTER STATEMENT;
+    
+    END payment_status_trigger;
+    """)
+
+def make_payment_trigger_null_safe(cursor):
+    # A NULL old status compared false with <> 'Paid', so paying such a row
+    # never activated its reservation
+    cursor.execute("""
+    CREATE OR REPLACE TRIGGER payment_status_trigger
+    FOR UPDATE OF pay_status ON payments
+    COMPOUND TRIGGER
+    
+    TYPE id_list IS TABLE OF NUMBER INDEX BY PLS_INTEGER;
+    v_resv_ids id_list;
+    
+    AFTER EACH ROW IS
+    BEGIN
+        IF :NEW.pay_status = 'Paid' AND NVL(:OLD.pay_status, 'x') <> 'Paid' AND :NEW.resv_id IS NOT NULL THEN
+            v_resv_ids(v_resv_ids.COUNT + 1) := :NEW.resv_id;
+        END IF;
+    END AFTER EACH ROW;
+    
+    AFTER STATEMENT IS
+    BEGIN
+        FORALL i IN 1 .. v_resv_ids.COUNT
+            UPDATE reserve
+            SET status = 'Active'
+            WHERE resv_id = v_resv_ids(i)
+            AND status = 'Pending';
+        v_resv_ids.DELETE;
+    END AFTER STATEMENT;
+    
+    END payment_status_trigger;
+    """)
+
+def create_booking_procedure(cursor):
+    # Books a car in one call. The car row lock serializes concurrent bookings
+    # of the same car, so the overlap check and the insert cannot race.
+    cursor.execute("""
+    CREATE OR REPLACE PROCEDURE book_car_proc (
+        p_customer_id IN NUMBER,
+        p_car_id IN NUMBER,
+        p_pickup_day IN DATE,
+        p_return_day IN DATE,
+        p_resv_id OUT NUMBER,
+        p_pay_id OUT NUMBER
+    ) IS
+        v_daily_price car.daily_price%TYPE;
+        v_overlaps NUMBER;
+    BEGIN
+        SELECT daily_price INTO v_daily_price
+        FROM car
+        WHERE car_id = p_car_id
+        FOR UPDATE WAIT 5;
+        
+        SELECT COUNT(*) INTO v_overlaps
+        FROM reserve
+        WHERE car_id = p_car_id
+        AND status IN ('Pending', 'Active')
+        AND pickup_day <= p_return_day
+        AND return_day >= p_pickup_day;
+        
+        IF v_overlaps > 0 THEN
+            RAISE_APPLICATION_ERROR(-20002, 'Car is already booked for these dates');
+        END IF;
+        
+        INSERT INTO reserve (customer_id, car_id, pickup_day, return_day)
+        VALUES (p_customer_id, p_car_id, p_pickup_day, p_return_day)
+        RETURNING resv_id INTO p_resv_id;
+        
+        -- Charged for every rental day, due the day after pickup
+        INSERT INTO payments (customer_id, resv_id, amount, due_date)
+        VALUES (p_customer_id, p_resv_id,
+                v_daily_price * (p_return_day - p_pickup_day + 1),
+                p_pickup_day + 1)
+        RETURNING pay_id INTO p_pay_id;
+        
+        COMMIT;
+    EXCEPTION
+        WHEN OTHERS THEN
+            ROLLBACK;
+            RAISE;
+    END;
+    """)
+
+def create_change_log(cursor):
+    # One row per change to a car's bookings (and one per statement on car),
+    # read by each process's availability snapshot. changed_at is epoch seconds.
+    try:
+        cursor.execute('''
+        CREATE TABLE change_log (
+            change_id NUMBER GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+            table_name VARCHAR2(30) NOT NULL,
+            car_id NUMBER,
+            changed_at NUMBER DEFAULT ((CAST(SYS_EXTRACT_UTC(SYSTIMESTAMP) AS DATE) - DATE '1970-01-01') * 86400) NOT NULL
+        )
+        ''')
+    except oracledb.DatabaseError as e:
+        error, = e.args
+        if error.code != 955:  # Table already exists
+            raise
+    
+    cursor.execute("""
+    CREATE OR REPLACE TRIGGER reserve_change_trigger
+    AFTER INSERT OR DELETE OR UPDATE OF car_id, pickup_day, return_day, status ON reserve
+    FOR EACH ROW
+    BEGIN
+        IF INSERTING OR UPDATING THEN
+            INSERT INTO change_log (table_name, car_id) VALUES ('RESERVE', :NEW.car_id);
+        END IF;
+        IF DELETING OR (UPDATING AND :OLD.car_id <> :NEW.car_id) THEN
+            INSERT INTO change_log (table_name, car_id) VALUES ('RESERVE', :OLD.car_id);
+        END IF;
+    END;
+    """)
+    
+    # Statement level: a bulk import logs one row, and readers reload the
+    # whole car list on any car change anyway
+    cursor.execute("""
+    CREATE OR REPLACE TRIGGER car_change_trigger
+    AFTER INSERT OR UPDATE OR DELETE ON car
+    BEGIN
+        INSERT INTO change_log (table_name) VALUES ('CAR');
+    END;
+    """)
+
+def create_job_leases(cursor):
+    # Lets one worker out of many claim a periodic job (see claim_job)
+    try:
+        cursor.execute('''
+        CREATE TABLE job_lease (
+            job_name VARCHAR2(50) PRIMARY KEY,
+            leased_until NUMBER NOT NULL
+        )
+        ''')
+    except oracledb.DatabaseError as e:
+        error, = e.args
+        if error.code != 955:  # Table already exists
+            raise
+    
+    try:
+        cursor.execute("INSERT INTO job_lease (job_name, leased_until) VALUES ('change_log_purge', 0)")
+    except oracledb.IntegrityError:
+        pass  # Row already there
+
+# (version, description, step). Never edit a shipped step; append a new one.
+# SQLite counterparts live in sqlite_backend.MIGRATION_OVERRIDES.
+MIGRATIONS = [
+    (1, "Base tables, triggers, procedure and function", migrate_base_schema),
+    (2, "Sample cars and admin account", seed_sample_data),
+    (3, "Indexes on foreign-key and status columns", create_hot_path_indexes),
+    (4, "Reservation return day and date-range index", add_reservation_return_day),
+    (5, "Indexes for reservation pagination", create_reservation_paging_indexes),
+    (6, "Dashboard summary table", create_dashboard_summary),
+    (7, "Set-based payment status trigger", make_payment_trigger_set_based),
+    (8, "Payment to reservation link and per-reservation activation", link_payments_to_reservations),
+    (9, "Single-call booking procedure", create_booking_procedure),
+    (10, "Change log for the availability snapshot", create_change_log),
+    (11, "Job leases for once-per-cluster maintenance", create_job_leases),
+    (12, "Drop the reserve index covered by the date-range index", drop_reserve_car_status_index),
+    (13, "Drop the unmaintained dashboard summary table", drop_dashboard_summary),
+    (14, "Payment trigger activates rows whose old status was NULL", make_payment_trigger_null_safe),
+]
+
+def run_migrations(conn):
+    with conn.cursor() as cursor:
+        # Create the version table on first run
+        try:
+            cursor.execute('''
+            CREATE TABLE schema_version (
+                version NUMBER PRIMARY KEY,
+                description VARCHAR2(200),
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            ''')
+        except oracledb.DatabaseError as e:
+            error, = e.args
+            if error.code != 955:  # Table already exists
+                raise
+        
+        cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+        current_version, = cursor.fetchone()
+        
+        for version, description, step in MIGRATIONS:
+            if version <= current_version:
+                continue
+            
+            if DB_BACKEND == "sqlite":
+                step = sqlite_backend.MIGRATION_OVERRIDES.get(version, step)
+            step(cursor)
+            
+            try:
+                cursor.execute(
+                    "INSERT INTO schema_version (version, description) VALUES (:1, :2)",
+                    [version, description]
+                )
+                conn.commit()
+            except oracledb.IntegrityError:
+                # Another process applied the same step concurrently
+                conn.rollback()
+            current_version = version
+        
+        return current_version
+
+# Once per process; a failed run is not cached, so the next rerun retries it
+@st.cache_resource
+def init_db():
+    try:
+        with get_connection() as conn:
+            return run_migrations(conn)
+    except oracledb.DatabaseError as e:
+        print(f"Database error: {e}")
+        raise
+
+# Representative shapes of the hot queries and the index each should use
+INDEX_CHECKS = [
+    ("get_available_cars", "SELECT COUNT(*) FROM reserve r WHERE r.car_id = 1 AND r.status = 'Active'", "idx_reserve_car_status_dates"),
+    ("get_customer_reservations", "SELECT r.resv_id FROM reserve r WHERE r.customer_id = 1 ORDER BY r.pickup_day DESC", "idx_reserve_customer_pickup"),
+    ("get_pending_payments", "SELECT p.pay_id FROM payments p WHERE p.pay_status = 'Pending' ORDER BY p.due_date", "idx_payments_status_due"),
+    ("get_customer_payments", "SELECT p.pay_id FROM payments p WHERE p.customer_id = 1 ORDER BY p.pay_date DESC", "idx_payments_customer_date"),
+    ("get_customer_id_by_user_id", "SELECT customer_id FROM customer WHERE user_id = 1", "idx_customer_user"),
+    ("get_employee_id_by_user_id", "SELECT emp_id FROM employee WHERE user_id = 1", "idx_employee_user"),
+]
+
+def explain_query(cursor, sql):
+    if DB_BACKEND == "sqlite":
+        cursor.execute("EXPLAIN QUERY PLAN " + sql)
+        return [row[3] for row in cursor]
+    
+    cursor.execute("EXPLAIN PLAN FOR " + sql)
+    cursor.execute("SELECT plan_table_output FROM TABLE(DBMS_XPLAN.DISPLAY(NULL, NULL, 'BASIC'))")
+    return [row[0] for row in cursor]
+
+def check_index_usage():
+    # Note: on nearly empty tables Oracle's optimizer may still prefer a full scan
+    try:
+        with get_connection() as conn:
+            with conn.cursor() as cursor:
+                result = []
+                for query_name, sql, index_name in INDEX_CHECKS:
+                    plan = explain_query(cursor, sql)
+                    result.append({
+                        "query": query_name,
+                        "index": index_name,
+                        "used": any(index_name.upper() in line.upper() for line in plan),
+                        "plan": "\n".join(plan)
+                    })
+                return result
+    except oracledb.DatabaseError as e:
+        print(f"Error in check_index_usage: {e}")
+        return []
@@ -7,6 +7,17 @@ DB_PASSWORD = os.getenv("DB_PASSWORD", "password")
 DB_HOST = os.getenv("DB_HOST", "localhost")
 DB_PORT = os.getenv("DB_PORT", "1521")
 DB_SERVICE = os.getenv("DB_SERVICE", "XEPDB1")
+DB_BACKEND = os.getenv("DB_BACKEND", "oracle")
+DB_SQLITE_PATH = os.getenv("DB_SQLITE_PATH", "car_rental.db")
+
+def reset_sqlite_database():
+    # The local engine keeps everything in one file (plus WAL side files)
+    for suffix in ["", "-wal", "-shm"]:
+        path = DB_SQLITE_PATH + suffix
+        if os.path.exists(path):
+            os.remove(path)
+            print(f"Removed {path}")
+    print("\nDatabase reset completed successfully!")
 
 def reset_database():
     try:
@@ -27,6 +38,10 @@ def reset_database():
 
                 # List of tables to drop in correct order (considering dependencies)
                 tables = [
+                    "SCHEMA_VERSION",
+                    "CHANGE_LOG",
+                    "JOB_LEASE",
+                    "DASHBOARD_SUMMARY",
                     "PAYMENTS",
                     "RESERVE",
                     "CAR",
@@ -53,4 +68,7 @@ def reset_database():
 
 if __name__ == "__main__":
     print("Starting database reset...")
-    reset_database()
\ No newline at end of file
+    if DB_BACKEND == "sqlite":
+        reset_sqlite_database()
+    else:
+        reset_database()
\ No newline at end of file
@@ -0,0 +1,616 @@
+import sqlite3
+import re
+import time
+import datetime
+import threading
+import queue
+import functools
+import oracledb
+
+# Local SQLite engine that behaves like the oracledb pool/connection/cursor
+# objects app.py uses, so the same data-access code (and the same Oracle SQL,
+# translated on the fly) runs on a plain Linux box without Oracle XE.
+
+# Store dates as ISO text, which is what TO_CHAR(..., 'YYYY-MM-DD') returns on Oracle
+sqlite3.register_adapter(datetime.date, lambda d: d.isoformat())
+sqlite3.register_adapter(datetime.datetime, lambda d: d.isoformat(" "))
+
+
+class Error:
+    # Mirrors the _Error object oracledb puts in exception args
+    def __init__(self, code, message):
+        self.code = code
+        self.message = message
+        self.full_code = f"ORA-{code:05d}"
+
+    def __str__(self):
+        return f"{self.full_code}: {self.message}"
+
+
+def to_oracle_error(exc):
+    message = str(exc)
+    match = re.match(r"ORA-(\d+): (.*)", message)
+    if match:
+        return oracledb.DatabaseError(Error(int(match.group(1)), match.group(2)))
+    if isinstance(exc, sqlite3.IntegrityError) and "FOREIGN KEY" in message:
+        return oracledb.IntegrityError(Error(2291, message))  # ORA-02291 parent key not found
+    if isinstance(exc, sqlite3.IntegrityError):
+        return oracledb.IntegrityError(Error(1, message))  # ORA-00001 unique constraint violated
+    if "duplicate column" in message:
+        return oracledb.DatabaseError(Error(1430, message))  # ORA-01430 column already exists
+    if "already exists" in message:
+        return oracledb.DatabaseError(Error(955, message))  # ORA-00955 name is already used
+    if "no such table" in message:
+        return oracledb.DatabaseError(Error(942, message))  # ORA-00942 table or view does not exist
+    if "no such index" in message:
+        return oracledb.DatabaseError(Error(1418, message))  # ORA-01418 index does not exist
+    if message == "interrupted":
+        return oracledb.DatabaseError(Error(3156, "call timeout exceeded"))  # ORA-03156 OCI call timed out
+    if "locked" in message:
+        return oracledb.DatabaseError(Error(54, message))  # ORA-00054 resource busy
+    return oracledb.DatabaseError(Error(0, message))
+
+
+# Oracle -> SQLite rewrites, applied in order
+TRANSLATIONS = [
+    (re.compile(r"NUMBER GENERATED ALWAYS AS IDENTITY PRIMARY KEY", re.I), "INTEGER PRIMARY KEY AUTOINCREMENT"),
+    (re.compile(r"TO_CHAR\(\s*([\w.]+)\s*,\s*'YYYY-MM-DD'\s*\)", re.I), r"\1"),
+    (re.compile(r"TO_DATE\(\s*(:\w+)\s*,\s*'YYYY-MM-DD'\s*\)", re.I), r"\1"),
+    (re.compile(r"\bNVL\(", re.I), "IFNULL("),
+    (re.compile(r"\bFROM\s+dual\b", re.I), ""),
+    (re.compile(r"\bFETCH\s+FIRST\s+(:\w+|\d+)\s+ROWS\s+ONLY", re.I), r"LIMIT \1"),
+    (re.compile(r"\s+INTO\s+:\w+(\s*,\s*:\w+)*\s*$", re.I), ""),  # RETURNING ... INTO :n
+    # :1 -> ?1, leaving string literals such as '12:30' alone
+    (re.compile(r"('(?:[^']|'')*')|:(\d+)"), lambda m: m.group(1) or f"?{m.group(2)}"),
+]
+
+@functools.lru_cache(maxsize=256)
+def translate(sql):
+    sql = sql.strip()
+    for pattern, replacement in TRANSLATIONS:
+        sql = pattern.sub(replacement, sql)
+    return sql
+
+
+class BatchError:
+    # Entry returned by cursor.getbatcherrors()
+    def __init__(self, offset, error):
+        self.offset = offset
+        self.code = error.code
+        self.message = error.message
+        self.full_code = error.full_code
+
+
+class Var:
+    # Stand-in for cursor.var(): RETURNING INTO fills it with a list, OUT params with a scalar
+    def __init__(self, value=None):
+        self.value = value
+
+    def getvalue(self):
+        return self.value
+
+    def setvalue(self, pos, value):
+        self.value = value
+
+
+class Cursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self._cursor = connection._conn.cursor()
+        self.arraysize = 100
+        self.prefetchrows = 2
+        self.batch_errors = []
+        self.dml_row_counts = []
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def var(self, type_=None, *args, **kwargs):
+        return Var()
+
+    def execute(self, sql, params=None):
+        self.connection._start_call()
+        params = params if params is not None else []
+        out_vars = []
+        if isinstance(params, (list, tuple)):
+            out_vars = [p for p in params if isinstance(p, Var)]
+            params = [p for p in params if not isinstance(p, Var)]
+        try:
+            self._cursor.execute(translate(sql), params)
+            if out_vars:
+                row = self._cursor.fetchall()[0]
+                for var, value in zip(out_vars, row):
+                    var.value = [value]
+        except sqlite3.Error as e:
+            raise to_oracle_error(e) from e
+        return self
+
+    def executemany(self, sql, seq_of_params, batcherrors=False, arraydmlrowcounts=False):
+        self.connection._start_call()
+        self.batch_errors = []
+        self.dml_row_counts = []
+        if batcherrors or arraydmlrowcounts:
+            # Row by row so one bad row only fails its own statement, as in Oracle
+            sql = translate(sql)
+            for offset, params in enumerate(seq_of_params):
+                try:
+                    self._cursor.execute(sql, params)
+                except sqlite3.Error as e:
+                    if not batcherrors:
+                        raise to_oracle_error(e) from e
+                    self.batch_errors.append(BatchError(offset, to_oracle_error(e).args[0]))
+                    self.dml_row_counts.append(0)
+                else:
+                    self.dml_row_counts.append(self._cursor.rowcount)
+            return
+        try:
+            self._cursor.executemany(translate(sql), seq_of_params)
+        except sqlite3.Error as e:
+            raise to_oracle_error(e) from e
+
+    def getbatcherrors(self):
+        return self.batch_errors
+
+    def getarraydmlrowcounts(self):
+        return self.dml_row_counts
+
+    def callproc(self, name, params=None):
+        self.connection._start_call()
+        try:
+            PROCEDURES[name.lower()](self, params or [])
+        except sqlite3.Error as e:
+            raise to_oracle_error(e) from e
+        return params
+
+    def callfunc(self, name, return_type, params=None):
+        self.connection._start_call()
+        try:
+            return FUNCTIONS[name.lower()](self, params or [])
+        except sqlite3.Error as e:
+            raise to_oracle_error(e) from e
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchmany(self, size=None):
+        return self._cursor.fetchmany(size or self.arraysize)
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def close(self):
+        self._cursor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Connection:
+    def __init__(self, conn, pool=None):
+        self._conn = conn
+        self._pool = pool
+        self._call_timeout = 0
+        self._deadline = None
+
+    @property
+    def call_timeout(self):
+        return self._call_timeout
+
+    @call_timeout.setter
+    def call_timeout(self, value):
+        # Milliseconds per call, as in oracledb; a statement that runs past it
+        # is interrupted from the progress handler
+        self._call_timeout = value
+        if value:
+            self._conn.set_progress_handler(self._past_deadline, 1000)
+        else:
+            self._conn.set_progress_handler(None, 0)
+
+    def _start_call(self):
+        if self._call_timeout:
+            self._deadline = time.monotonic() + self._call_timeout / 1000
+
+    def _past_deadline(self):
+        return self._deadline is not None and time.monotonic() > self._deadline
+
+    def cursor(self):
+        return Cursor(self)
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def ping(self):
+        self._conn.execute("SELECT 1").fetchone()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.release(self)
+        else:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def connect(path, timeout=5.0, stmtcachesize=40):
+    uri = False
+    if path == ":memory:":
+        # Every pooled connection has to see the same in-memory database
+        path, uri = "file:car_rental?mode=memory&cache=shared", True
+    conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False,
+                           cached_statements=stmtcachesize, uri=uri)
+    conn.execute("PRAGMA foreign_keys = ON")
+    if not uri:
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+    return conn
+
+
+class Pool:
+    # Same surface as the oracledb pool: acquire() plus opened/busy/min/max counters
+    def __init__(self, path, min=1, max=10, increment=1, ping_interval=0,
+                 wait_timeout=5000, stmtcachesize=40, **kwargs):
+        self.path = path
+        self.min = min
+        self.max = max
+        self.increment = increment
+        self.ping_interval = ping_interval
+        self.wait_timeout = wait_timeout
+        self.stmtcachesize = stmtcachesize
+        self.opened = 0
+        self.busy = 0
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        for _ in range(min):
+            self._idle.put(self._open())
+
+    def _open(self):
+        self.opened += 1
+        return Connection(connect(self.path, stmtcachesize=self.stmtcachesize), pool=self)
+
+    def acquire(self):
+        with self._lock:
+            if self._idle.empty() and self.opened < self.max:
+                conn = self._open()
+            else:
+                conn = None
+        if conn is None:
+            try:
+                conn = self._idle.get(timeout=self.wait_timeout / 1000)
+            except queue.Empty:
+                raise oracledb.DatabaseError(Error(24459, "timed out waiting for pool to create new connections"))
+        if self.ping_interval == 0:
+            conn.ping()
+        with self._lock:
+            self.busy += 1
+        return conn
+
+    def release(self, conn):
+        conn._conn.rollback()  # Discard anything left uncommitted, like oracledb does
+        with self._lock:
+            self.busy -= 1
+        self._idle.put(conn)
+
+
+def create_pool(path, **kwargs):
+    return Pool(path, **kwargs)
+
+
+# Emulated PL/SQL procedures and functions, called through cursor.callproc/callfunc
+
+def update_reservation_status_proc(cursor, params):
+    resv_id, status, success_var = params
+    conn = cursor.connection._conn
+    try:
+        result = conn.execute("UPDATE reserve SET status = ? WHERE resv_id = ?", [status, resv_id])
+        if result.rowcount > 0:
+            success_var.value = 1
+            conn.commit()
+        else:
+            success_var.value = 0
+            conn.rollback()
+    except sqlite3.Error:
+        success_var.value = 0
+        conn.rollback()
+
+def book_car_proc(cursor, params):
+    customer_id, car_id, pickup_day, return_day, resv_id_var, pay_id_var = params
+    conn = cursor.connection._conn
+    # BEGIN IMMEDIATE takes the write lock up front, standing in for the
+    # car row lock, so no other booking can slip in between check and insert
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute("SELECT daily_price FROM car WHERE car_id = ?", [car_id]).fetchone()
+        if row is None:
+            raise sqlite3.DatabaseError("ORA-01403: no data found")
+        daily_price, = row
+
+        overlaps, = conn.execute('''
+            SELECT COUNT(*)
+            FROM reserve
+            WHERE car_id = ?
+            AND status IN ('Pending', 'Active')
+            AND pickup_day <= ?
+            AND return_day >= ?
+        ''', [car_id, return_day, pickup_day]).fetchone()
+        if overlaps > 0:
+            raise sqlite3.DatabaseError("ORA-20002: Car is already booked for these dates")
+
+        resv_id_var.value = conn.execute('''
+            INSERT INTO reserve (customer_id, car_id, pickup_day, return_day)
+            VALUES (?, ?, ?, ?)
+        ''', [customer_id, car_id, pickup_day, return_day]).lastrowid
+
+        pay_id_var.value = conn.execute('''
+            INSERT INTO payments (customer_id, resv_id, amount, due_date)
+            VALUES (?, ?, ?, ?)
+        ''', [customer_id, resv_id_var.value,
+              daily_price * ((return_day - pickup_day).days + 1),
+              pickup_day + datetime.timedelta(days=1)]).lastrowid
+
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+
+def get_customer_info_func(cursor, params):
+    customer_id, = params
+    ref_cursor = cursor.connection.cursor()
+    return ref_cursor.execute('''
+        SELECT name, email, phone, address, street, city,
+               id_number, license
+        FROM customer
+        WHERE customer_id = :1
+    ''', [customer_id])
+
+PROCEDURES = {
+    "update_reservation_status_proc": update_reservation_status_proc,
+    "book_car_proc": book_car_proc,
+}
+
+FUNCTIONS = {
+    "get_customer_info_func": get_customer_info_func,
+}
+
+
+# SQLite versions of migrations whose Oracle step uses dictionary views or PL/SQL
+
+def migrate_base_schema(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username VARCHAR2(100) UNIQUE NOT NULL,
+            password VARCHAR2(255) NOT NULL,
+            user_type VARCHAR2(50) NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS customer (
+            customer_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id NUMBER,
+            name VARCHAR2(100) NOT NULL,
+            email VARCHAR2(100),
+            phone VARCHAR2(50),
+            address VARCHAR2(200),
+            street VARCHAR2(100),
+            city VARCHAR2(100),
+            id_number VARCHAR2(20),
+            license VARCHAR2(20),
+            CONSTRAINT fk_customer_user_id FOREIGN KEY (user_id) REFERENCES users(user_id)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS employee (
+            emp_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id NUMBER,
+            name VARCHAR2(100) NOT NULL,
+            email VARCHAR2(100),
+            phone VARCHAR2(50),
+            address VARCHAR2(200),
+            street VARCHAR2(100),
+            city VARCHAR2(100),
+            CONSTRAINT fk_employee_user_id FOREIGN KEY (user_id) REFERENCES users(user_id)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS car (
+            car_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            model VARCHAR2(100) NOT NULL,
+            plate_no VARCHAR2(20) UNIQUE NOT NULL,
+            daily_price NUMBER NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS reserve (
+            resv_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            customer_id NUMBER NOT NULL,
+            car_id NUMBER NOT NULL,
+            pickup_day DATE NOT NULL,
+            reserve_date DATE DEFAULT CURRENT_DATE,
+            status VARCHAR2(50) DEFAULT 'Pending',
+            CONSTRAINT fk_reserve_customer FOREIGN KEY (customer_id) REFERENCES customer(customer_id),
+            CONSTRAINT fk_reserve_car FOREIGN KEY (car_id) REFERENCES car(car_id)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS payments (
+            pay_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            customer_id NUMBER NOT NULL,
+            amount NUMBER NOT NULL,
+            pay_date DATE DEFAULT CURRENT_DATE,
+            due_date DATE,
+            method VARCHAR2(50),
+            pay_status VARCHAR2(50) DEFAULT 'Pending',
+            employee_id NUMBER,
+            CONSTRAINT fk_payments_customer FOREIGN KEY (customer_id) REFERENCES customer(customer_id),
+            CONSTRAINT fk_payments_employee FOREIGN KEY (employee_id) REFERENCES employee(emp_id)
+        )
+    ''')
+
+    # Emulates check_reservation_date
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS check_reservation_date
+        BEFORE INSERT ON reserve
+        FOR EACH ROW
+        WHEN NEW.pickup_day < date('now', 'localtime')
+        BEGIN
+            SELECT RAISE(ABORT, 'ORA-20001: Pickup date cannot be before current date');
+        END
+    ''')
+
+    # Emulates payment_status_trigger
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS payment_status_trigger
+        AFTER UPDATE OF pay_status ON payments
+        FOR EACH ROW
+        WHEN NEW.pay_status = 'Paid'
+        BEGIN
+            UPDATE reserve
+            SET status = 'Active'
+            WHERE customer_id = NEW.customer_id
+            AND status = 'Pending';
+        END
+    ''')
+
+def make_payment_trigger_set_based(cursor):
+    # The row-level trigger above already activates reservations for every
+    # row of a multi-row update; only the Oracle compound trigger needs this
+    pass
+
+def link_payments_to_reservations(cursor):
+    try:
+        cursor.execute('''
+            ALTER TABLE payments ADD resv_id NUMBER
+                CONSTRAINT fk_payments_reserve REFERENCES reserve(resv_id)
+        ''')
+    except oracledb.DatabaseError as e:
+        error, = e.args
+        if error.code != 1430:  # Column already exists
+            raise
+
+    # Existing payments are due the day after their reservation's pickup
+    cursor.execute('''
+        UPDATE payments
+        SET resv_id = (
+            SELECT MIN(r.resv_id)
+            FROM reserve r
+            WHERE r.customer_id = payments.customer_id
+            AND r.pickup_day = date(payments.due_date, '-1 day')
+        )
+        WHERE resv_id IS NULL
+    ''')
+
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_payments_resv ON payments (resv_id)")
+
+    # Emulates the per-reservation payment_status_trigger
+    cursor.execute("DROP TRIGGER IF EXISTS payment_status_trigger")
+    cursor.execute('''
+        CREATE TRIGGER payment_status_trigger
+        AFTER UPDATE OF pay_status ON payments
+        FOR EACH ROW
+        WHEN NEW.pay_status = 'Paid' AND OLD.pay_status <> 'Paid'
+        BEGIN
+            UPDATE reserve
+            SET status = 'Active'
+            WHERE resv_id = NEW.resv_id
+            AND status = 'Pending';
+        END
+    ''')
+
+def make_payment_trigger_null_safe(cursor):
+    cursor.execute("DROP TRIGGER IF EXISTS payment_status_trigger")
+    cursor.execute('''
+        CREATE TRIGGER payment_status_trigger
+        AFTER UPDATE OF pay_status ON payments
+        FOR EACH ROW
+        WHEN NEW.pay_status = 'Paid' AND IFNULL(OLD.pay_status, 'x') <> 'Paid'
+        BEGIN
+            UPDATE reserve
+            SET status = 'Active'
+            WHERE resv_id = NEW.resv_id
+            AND status = 'Pending';
+        END
+    ''')
+
+def create_booking_procedure(cursor):
+    # book_car_proc is emulated in PROCEDURES; there is nothing to create
+    pass
+
+def create_change_log(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS change_log (
+            change_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name VARCHAR2(30) NOT NULL,
+            car_id NUMBER,
+            changed_at NUMBER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
+        )
+    ''')
+
+    # Emulates reserve_change_trigger
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS reserve_change_insert
+        AFTER INSERT ON reserve
+        FOR EACH ROW
+        BEGIN
+            INSERT INTO change_log (table_name, car_id) VALUES ('RESERVE', NEW.car_id);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS reserve_change_update
+        AFTER UPDATE OF car_id, pickup_day, return_day, status ON reserve
+        FOR EACH ROW
+        BEGIN
+            INSERT INTO change_log (table_name, car_id) VALUES ('RESERVE', NEW.car_id);
+            INSERT INTO change_log (table_name, car_id)
+            SELECT 'RESERVE', OLD.car_id WHERE OLD.car_id <> NEW.car_id;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS reserve_change_delete
+        AFTER DELETE ON reserve
+        FOR EACH ROW
+        BEGIN
+            INSERT INTO change_log (table_name, car_id) VALUES ('RESERVE', OLD.car_id);
+        END
+    ''')
+
+    # Emulates car_change_trigger; SQLite has no statement-level triggers,
+    # so this logs one row per car
+    for event, ref in [("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")]:
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS car_change_{event.lower()}
+            AFTER {event} ON car
+            FOR EACH ROW
+            BEGIN
+                INSERT INTO change_log (table_name, car_id) VALUES ('CAR', {ref}.car_id);
+            END
+        ''')
+
+MIGRATION_OVERRIDES = {
+    1: migrate_base_schema,
+    7: make_payment_trigger_set_based,
+    8: link_payments_to_reservations,
+    9: create_booking_procedure,
+    10: create_change_log,
+    14: make_payment_trigger_null_safe,
+}
@@ -0,0 +1,32 @@
+import os
+import sys
+import tempfile
+import uuid
+
+# The app modules read their configuration on import: point them at a
+# throwaway SQLite database before any test imports them
+os.environ["DB_BACKEND"] = "sqlite"
+os.environ["DB_SQLITE_PATH"] = os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ["CACHE_BUS"] = "local"
+os.environ["AVAILABILITY_REFRESH_INTERVAL"] = "0"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+@pytest.fixture(scope="session")
+def db():
+    import migrations
+    migrations.init_db()
+
+@pytest.fixture
+def customer_id(db):
+    import app
+    import auth
+    name = f"test_{uuid.uuid4().hex[:8]}"
+    user_id = auth.register_user(name, "secret", "Customer")
+    return app.register_customer(user_id, name, f"{name}@example.com", "555", "", "", "", name, name)
+
+@pytest.fixture
+def car_id(db):
+    import app
+    return app.add_car("Test Car", f"T-{uuid.uuid4().hex[:8]}", 40.0)
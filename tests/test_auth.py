@@ -0,0 +1,41 @@
+import time
+
+import auth
+from auth import TokenBucketLimiter
+
+def test_limiter_spends_burst_then_refuses():
+    limiter = TokenBucketLimiter(burst=3, refill_rate=0)
+    assert [limiter.allow("ip:1") for _ in range(4)] == [True, True, True, False]
+    # Keys have separate buckets
+    assert limiter.allow("ip:2")
+
+def test_limiter_refills_over_time():
+    limiter = TokenBucketLimiter(burst=2, refill_rate=1)
+    now = 100.0
+    limiter.buckets["ip:1"] = (0, now)
+    assert limiter.tokens("ip:1", now + 1.5) == 1.5
+    assert limiter.tokens("ip:1", now + 10) == 2
+
+def test_available_does_not_spend():
+    limiter = TokenBucketLimiter(burst=1, refill_rate=0)
+    assert limiter.available("user:a")
+    assert limiter.available("user:a")
+    assert limiter.allow("user:a")
+    assert not limiter.available("user:a")
+
+def test_limiter_forgets_refilled_buckets():
+    limiter = TokenBucketLimiter(burst=1, refill_rate=1, max_keys=2)
+    limiter.buckets = {"a": (0, time.monotonic() - 10), "b": (0, time.monotonic())}
+    limiter.allow("c")
+    # "a" has refilled and is dropped; "b" and "c" are still short of tokens
+    assert set(limiter.buckets) == {"b", "c"}
+
+def test_password_hash_round_trip():
+    stored = auth.hash_password("secret", iterations=1000)
+    assert auth.verify_password("secret", stored) == (True, True)  # Fewer iterations than configured
+    assert auth.verify_password("wrong", stored)[0] is False
+
+def test_login(db):
+    auth.register_user("login_test", "secret", "Customer")
+    assert auth.authenticate("login_test", "secret")["user_type"] == "Customer"
+    assert auth.authenticate("login_test", "wrong") is None
@@ -0,0 +1,43 @@
+import oracledb
+import pytest
+
+import app
+from db import get_connection
+
+def reservation(resv_id):
+    with get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT car_id, pickup_day, return_day, status FROM reserve WHERE resv_id = :1", [resv_id])
+            return cursor.fetchone()
+
+def test_book_car_creates_reservation_and_payment(customer_id, car_id):
+    resv_id, pay_id = app.book_car(customer_id, car_id, "2030-05-01", "2030-05-03")
+    assert reservation(resv_id) == (car_id, "2030-05-01", "2030-05-03", "Pending")
+    with get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT resv_id, amount, due_date FROM payments WHERE pay_id = :1", [pay_id])
+            # Three days at 40.0, due the day after pickup
+            assert cursor.fetchone() == (resv_id, 120.0, "2030-05-02")
+
+def test_book_car_rejects_overlap(customer_id, car_id):
+    app.book_car(customer_id, car_id, "2030-06-10", "2030-06-12")
+    with pytest.raises(oracledb.DatabaseError) as excinfo:
+        app.book_car(customer_id, car_id, "2030-06-12", "2030-06-14")
+    error, = excinfo.value.args
+    assert error.code == app.BOOKING_CONFLICT_CODE
+    # Touching days are an overlap, the day after is not
+    assert app.make_reservation(customer_id, car_id, "2030-06-13") is not None
+
+def test_make_reservation_rejects_reversed_dates(customer_id, car_id):
+    assert app.make_reservation(customer_id, car_id, "2030-07-02", "2030-07-01") is None
+
+def test_update_reservation_status(customer_id, car_id):
+    resv_id = app.make_reservation(customer_id, car_id, "2030-08-01")
+    assert app.update_reservation_status(resv_id, "Cancelled")
+    assert reservation(resv_id)[3] == "Cancelled"
+    assert not app.update_reservation_status(-1, "Cancelled")
+
+def test_available_cars_for_dates(customer_id, car_id):
+    app.make_reservation(customer_id, car_id, "2030-09-10", "2030-09-12")
+    assert car_id not in app.get_available_cars("2030-09-11", "2030-09-20")["car_id"].tolist()
+    assert car_id in app.get_available_cars("2030-09-13", "2030-09-20")["car_id"].tolist()
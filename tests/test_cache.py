@@ -0,0 +1,43 @@
+from cache import ReadThroughCache
+
+def test_get_loads_once_until_invalidated():
+    cache = ReadThroughCache(ttl=60)
+    loads = []
+    def loader():
+        loads.append(1)
+        return len(loads)
+    assert cache.get(("all_cars",), loader) == 1
+    assert cache.get(("all_cars",), loader) == 1
+    cache.invalidate("all_cars")
+    assert cache.get(("all_cars",), loader) == 2
+    assert cache.stats()["hits"] == 1
+
+def test_invalidate_only_evicts_named_datasets():
+    cache = ReadThroughCache(ttl=60)
+    cache.get(("all_cars",), lambda: "cars")
+    cache.get(("available_cars",), lambda: "available")
+    cache.invalidate("available_cars")
+    assert cache.get(("all_cars",), lambda: "reloaded") == "cars"
+    assert cache.get(("available_cars",), lambda: "reloaded") == "reloaded"
+
+def test_load_straddling_invalidation_is_not_stored():
+    cache = ReadThroughCache(ttl=60)
+    def stale_loader():
+        # A write lands while this read is still running
+        cache.invalidate("all_cars")
+        return "stale"
+    assert cache.get(("all_cars",), stale_loader) == "stale"
+    assert cache.get(("all_cars",), lambda: "fresh") == "fresh"
+
+def test_clear_all_bumps_every_generation():
+    cache = ReadThroughCache(ttl=60)
+    def stale_loader():
+        cache.invalidate()
+        return "stale"
+    cache.get(("available_cars", "2030-01-01"), stale_loader)
+    assert cache.stats()["entries"] == 0
+
+def test_expired_entries_are_reloaded():
+    cache = ReadThroughCache(ttl=60)
+    cache.get(("all_cars",), lambda: "old")
+    assert cache.get(("all_cars",), lambda: "new", ttl=0) == "new"
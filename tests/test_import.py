@@ -0,0 +1,44 @@
+import io
+import uuid
+
+import pandas as pd
+import pytest
+
+import app
+
+def test_validate_car_rows():
+    chunk = pd.DataFrame({
+        "model": ["Civic", " Golf ", None, "Polo", "Fiesta", "Yaris"],
+        "plate_no": ["A 1", "B2", "C3", "A 1", "D4", 12345],
+        "daily_price": ["40", 55, 30, 20, "-1", 35]
+    })
+    valid, failures = app.validate_car_rows(chunk, 2, {"EXISTING"})
+    assert valid == [(2, "Civic", "A 1", 40.0), (3, "Golf", "B2", 55.0), (7, "Yaris", "12345", 35.0)]
+    assert [(failure["row"], failure["reason"]) for failure in failures] == [
+        (4, "model and plate_no are required"),
+        (5, "plate_no already exists"),
+        (6, "daily_price must be a positive number")
+    ]
+
+def test_validate_rejects_known_plates():
+    chunk = pd.DataFrame({"model": ["Civic"], "plate_no": ["EXISTING"], "daily_price": [40]})
+    valid, failures = app.validate_car_rows(chunk, 1, {"EXISTING"})
+    assert valid == [] and failures[0]["reason"] == "plate_no already exists"
+
+def test_import_cars_csv(db):
+    prefix = uuid.uuid4().hex[:6]
+    source = io.StringIO(
+        "model,plate_no,daily_price\n"
+        f"Civic,{prefix}-1,40\n"
+        f"Golf,{prefix}-2,abc\n"
+        f"Polo,{prefix}-3,30\n"
+    )
+    result = app.import_cars(source, chunk_size=2)
+    assert result["inserted"] == 2
+    assert [failure["row"] for failure in result["failed"]] == [2]
+    plates = app.get_all_cars()["plate_no"].tolist()
+    assert f"{prefix}-1" in plates and f"{prefix}-3" in plates
+
+def test_import_cars_missing_column(db):
+    with pytest.raises(ValueError):
+        app.import_cars(io.StringIO("model,daily_price\nCivic,40\n"))
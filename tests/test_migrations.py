@@ -0,0 +1,30 @@
+import migrations
+from db import get_connection
+
+def test_migrations_reach_latest_version(db):
+    with get_connection() as conn:
+        assert migrations.run_migrations(conn) == migrations.MIGRATIONS[-1][0]
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT version FROM schema_version ORDER BY version")
+            assert [version for version, in cursor] == [version for version, _, _ in migrations.MIGRATIONS]
+
+def test_migrations_rerun_is_a_no_op(db):
+    with get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM schema_version")
+            before, = cursor.fetchone()
+        migrations.run_migrations(conn)
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM schema_version")
+            assert cursor.fetchone() == (before,)
+
+def test_paying_activates_reservation_with_null_status(db, customer_id, car_id):
+    import app
+    resv_id, pay_id = app.book_car(customer_id, car_id, "2031-01-10", "2031-01-11")
+    with get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("UPDATE payments SET pay_status = NULL WHERE pay_id = :1", [pay_id])
+            cursor.execute("UPDATE payments SET pay_status = 'Paid' WHERE pay_id = :1", [pay_id])
+            conn.commit()
+            cursor.execute("SELECT status FROM reserve WHERE resv_id = :1", [resv_id])
+            assert cursor.fetchone() == ("Active",)
@@ -0,0 +1,26 @@
+import app
+
+def test_reservations_page_walks_every_row_once(customer_id, car_id):
+    for day in range(1, 8):
+        app.make_reservation(customer_id, car_id, f"2032-03-{day:02d}")
+
+    status = "Pending"
+    expected, _ = app.get_reservations_page(status, limit=10000)
+    seen = []
+    after = None
+    while True:
+        page, after = app.get_reservations_page(status, after, limit=3)
+        assert len(page) <= 3
+        seen.extend(page["resv_id"].tolist())
+        if after is None:
+            break
+
+    assert seen == expected["resv_id"].tolist()
+    assert len(seen) == len(set(seen)) >= 7
+
+def test_reservations_page_newest_first(customer_id, car_id):
+    first = app.make_reservation(customer_id, car_id, "2032-04-01")
+    second = app.make_reservation(customer_id, car_id, "2032-04-02")
+    page, _ = app.get_reservations_page(limit=2)
+    # Same reserve_date: ties go to the higher resv_id
+    assert page["resv_id"].tolist() == [second, first]
@@ -0,0 +1,45 @@
+import oracledb
+import pytest
+
+import sqlite_backend
+from sqlite_backend import translate
+
+def test_translate_numbered_binds():
+    assert translate("SELECT * FROM car WHERE car_id = :1 AND model = :2") == \
+        "SELECT * FROM car WHERE car_id = ?1 AND model = ?2"
+
+def test_translate_leaves_binds_inside_literals():
+    assert translate("SELECT ':1', 'it''s :2' FROM car WHERE car_id = :3") == \
+        "SELECT ':1', 'it''s :2' FROM car WHERE car_id = ?3"
+    assert translate("SELECT * FROM t WHERE at = '12:30' AND id = :1") == \
+        "SELECT * FROM t WHERE at = '12:30' AND id = ?1"
+
+def test_translate_oracle_syntax():
+    assert translate("SELECT TO_CHAR(r.pickup_day, 'YYYY-MM-DD') FROM reserve r") == \
+        "SELECT r.pickup_day FROM reserve r"
+    assert translate("SELECT NVL(MAX(x), 0) FROM dual").strip() == "SELECT IFNULL(MAX(x), 0)"
+    assert translate("SELECT * FROM car FETCH FIRST :page_size ROWS ONLY") == \
+        "SELECT * FROM car LIMIT :page_size"
+    assert translate("INSERT INTO car (model) VALUES (:1) RETURNING car_id INTO :2") == \
+        "INSERT INTO car (model) VALUES (?1) RETURNING car_id"
+
+def connect():
+    return sqlite_backend.Connection(sqlite_backend.connect(":memory:"))
+
+def test_errors_carry_oracle_codes():
+    conn = connect()
+    with pytest.raises(oracledb.DatabaseError) as excinfo:
+        conn.cursor().execute("SELECT * FROM missing_table")
+    error, = excinfo.value.args
+    assert error.code == 942
+
+def test_call_timeout_interrupts_statement():
+    conn = connect()
+    conn.call_timeout = 50
+    with pytest.raises(oracledb.DatabaseError) as excinfo:
+        conn.cursor().execute('''
+            WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n)
+            SELECT COUNT(*) FROM n
+        ''')
+    error, = excinfo.value.args
+    assert error.code == 3156